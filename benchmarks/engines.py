@@ -0,0 +1,205 @@
+"""
+Benchmarks for the vectorized engines in scraper.py, compared against the code they replaced.
+
+Every benchmark checks that both versions give the same output before timing them.
+
+    poetry run python -m benchmarks.engines
+"""
+import argparse
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+import scraper
+
+
+def timed(func, *args, repeat=3):
+    """ Best wall time of func(*args) over repeat runs. Returns (seconds, last result). """
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        result = func(*args)
+        best = min(best, perf_counter() - start)
+    return best, result
+
+def report(name, rows, legacy_time, new_time):
+    print(f'{name:<24} {rows:>9,} rows  legacy {legacy_time:8.3f}s  new {new_time:8.3f}s  {legacy_time / new_time:6.1f}x')
+
+### Table.to_numeric ###
+def legacy_to_numeric(df, cols):
+    df[cols] = df[cols].replace(r'[$,)]', '', regex=True).replace(r'[(]', '-', regex=True)
+    df[cols] = df[cols].apply(pd.to_numeric, errors='coerce', axis=1)
+    df[cols] = df[cols].round(2)
+
+def numeric_frame(rows, seed=0):
+    """ Report-like cells: dollars, thousands separators, accounting negatives, placeholders, blanks and numbers. """
+    rng = np.random.default_rng(seed)
+    amounts = rng.normal(0, 1e6, size=(rows, 4)).round(2)
+    formats = [lambda x: f'${x:,.2f}',
+               lambda x: f'({abs(x):,.2f})',
+               lambda x: f'{x:,.0f}',
+               lambda x: '-',
+               lambda x: '',
+               lambda x: x]
+    picks = rng.integers(0, len(formats), size=amounts.shape)
+    cols = ['Handle', 'Amount Won', 'Promotional Credits', 'Revenue']
+    data = {col: [formats[p](x) for p, x in zip(picks[:, i], amounts[:, i])] for i, col in enumerate(cols)}
+    return pd.DataFrame({'Provider': 'Provider', **data}), cols
+
+def bench_to_numeric(rows):
+    df, cols = numeric_frame(rows)
+    def run(to_numeric):
+        out = df.copy()
+        to_numeric(out, cols)
+        return out
+    legacy_time, legacy = timed(run, legacy_to_numeric)
+    new_time, new = timed(run, scraper.Table.to_numeric)
+    pd.testing.assert_frame_equal(legacy, new, check_dtype=False)
+    # Trailing '-' placeholders are stripped rather than lost.
+    check = pd.DataFrame({'x': ['1,234-', '-', '(5)', ' ']})
+    scraper.Table.to_numeric(check, ['x'])
+    assert check['x'].tolist()[0] == 1234 and check['x'].tolist()[2] == -5 and check['x'].isna().tolist() == [False, True, False, True]
+    report('Table.to_numeric', rows, legacy_time, new_time)
+
+### Arizona report lines ###
+def legacy_get_provider(line):
+    values = line.split()
+    provider = []
+    for val in values:
+        if val == '-' or val == '$':
+            break
+        else:
+            val = val.replace(',', '')
+            try:
+                float(val)
+                break
+            except ValueError:
+                provider.append(val)
+    return ' '.join(provider)
+
+def legacy_get_numerical(line):
+    values = line.split()
+    numerical = []
+    for val in values:
+        val = val.strip('$')
+        if '-' in val:
+            numerical.append(0)
+        else:
+            val = val.replace(',', '')
+            try:
+                numerical.append(float(val))
+            except ValueError:
+                continue
+    return numerical
+
+def legacy_arizona(reports, dates):
+    data = []
+    for lines, dt in zip(reports, dates):
+        for line in lines:
+            provider = legacy_get_provider(line)
+            if provider == '':
+                break
+            values = legacy_get_numerical(line)
+            for sub_category, offset in [('Retail', 0), ('Online', 1)]:
+                data.append({
+                    'State': scraper.Arizona.state,
+                    'Category': scraper.Arizona.category,
+                    'Sub-Category': sub_category,
+                    'Date': dt,
+                    'Provider': provider,
+                    'Gross Wagering Receipts': values[0 + offset],
+                    'Amount Won': values[2 + offset],
+                    'Adjusted Gross Wagering Receipts': values[4 + offset],
+                    'Promotional Credits': values[6 + offset]
+                })
+    return pd.DataFrame(data)
+
+def arizona_reports(rows, seed=0, per_report=20):
+    """ Report lines like '<provider> $ 1,234.56 - $ 20 ...', grouped into monthly reports. """
+    rng = np.random.default_rng(seed)
+    names = ['BetMGM', 'Hard Rock Sportsbook', 'DraftKings', 'FanDuel Sportsbook', 'Caesars', 'Desert Diamond Sports']
+    formats = [lambda x: f'$ {x:,.2f}', lambda x: f'{x:,.2f}', lambda x: '-', lambda x: '$ -']
+    reports, dates = [], []
+    for i in range(0, rows, per_report):
+        lines = []
+        for _ in range(min(per_report, rows - i)):
+            amounts = rng.uniform(0, 1e7, size=scraper.Arizona.width)
+            picks = rng.integers(0, len(formats), size=scraper.Arizona.width)
+            lines.append(' '.join([names[rng.integers(len(names))], *(formats[p](x) for p, x in zip(picks, amounts))]))
+        reports.append(lines)
+        dates.append(pd.Timestamp(2021, 9, 1) + pd.DateOffset(months=len(dates) % 120))
+    return reports, dates
+
+def bench_arizona(rows):
+    reports, dates = arizona_reports(rows)
+    legacy_time, legacy = timed(legacy_arizona, reports, dates)
+    new_time, new = timed(scraper.Arizona.parse_reports, reports, dates)
+    pd.testing.assert_frame_equal(legacy, new, check_dtype=False)
+    report('Arizona.parse_reports', rows, legacy_time, new_time)
+
+### Iowa.fix_whitespace ###
+def legacy_fix_whitespace(df, col):
+    mistake = None
+    for idx, entry in enumerate(df[col]):
+        if pd.isna(entry):
+            entry, next_entry = df.at[idx+1, col].split('  ')
+            df.at[idx+1, col] = next_entry
+        if mistake:
+            entry = f'{mistake} {entry}'
+            mistake = None
+        if '  ' in entry:
+            entry, mistake = entry.split('  ')
+        df.at[idx, col] = entry.replace('\n', ' ').replace('  ', ' ')
+
+def provider_frame(rows, seed=0):
+    """ Provider names as camelot reads them: wrapped with \n, merged into the next row by a double space or left empty. """
+    rng = np.random.default_rng(seed)
+    words = np.array(['Casino', 'Queen', 'Ameristar', 'Council', 'Bluffs', 'Hard', 'Rock', 'Sioux', 'City', 'DraftKings'])
+    names = [' '.join(rng.choice(words, size=rng.integers(1, 4))) for _ in range(rows)]
+    names = [name.replace(' ', '\n', 1) if rng.random() < 0.2 else name for name in names]
+    for idx in rng.choice(rows - 1, size=rows // 5, replace=False):
+        this, after = names[idx], names[idx + 1]
+        if this is None or after is None or '  ' in this or '  ' in after:
+            continue
+        if rng.random() < 0.5:
+            # An empty row, with its name merged into the start of the next row.
+            names[idx], names[idx + 1] = None, f'{this}  {after}'
+        elif ' ' in after:
+            # The first word of the next name, merged into the end of this row.
+            first, rest = after.split(' ', 1)
+            names[idx], names[idx + 1] = f'{this}  {first}', rest
+    return pd.DataFrame({'Provider': names})
+
+def bench_fix_whitespace(rows):
+    # Randomized equivalence first, on many small frames, then timing on one large one.
+    for seed in range(200):
+        df = provider_frame(50, seed)
+        legacy, new = df.copy(), df.copy()
+        legacy_fix_whitespace(legacy, 'Provider')
+        scraper.Iowa.fix_whitespace(new, 'Provider')
+        pd.testing.assert_frame_equal(legacy, new, check_dtype=False)
+    df = provider_frame(rows)
+    def run(fix_whitespace):
+        out = df.copy()
+        fix_whitespace(out, 'Provider')
+        return out
+    legacy_time, legacy = timed(run, legacy_fix_whitespace)
+    new_time, new = timed(run, scraper.Iowa.fix_whitespace)
+    pd.testing.assert_frame_equal(legacy, new, check_dtype=False)
+    report('Iowa.fix_whitespace', rows, legacy_time, new_time)
+
+
+BENCHMARKS = {
+    'to_numeric': bench_to_numeric,
+    'arizona': bench_arizona,
+    'fix_whitespace': bench_fix_whitespace,
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('names', nargs='*', default=list(BENCHMARKS), help=f'Benchmarks to run: {", ".join(BENCHMARKS)}')
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+    for name in args.names:
+        BENCHMARKS[name](args.rows)
@@ -0,0 +1,203 @@
+"""
+Offline benchmarks for every parser's clean() path, run against recorded source files.
+
+Recorded files live in benchmarks/fixtures/<host>/<path>, listed by parser in benchmarks/fixtures/index.json.
+Synthetic ones, written by benchmarks/synthetic.py, cover the parsers with no shareable recordings.
+They are served by a local HTTP stand-in, which scraper.py is pointed at through SCRAPER_MIRROR,
+with a temporary download cache so nothing is reused between runs.
+
+    poetry run python -m benchmarks.parsers --record Arizona <url> [<url> ...]
+    poetry run python -m benchmarks.parsers [Arizona ...] [--runs 5] [--threshold 0.25] [--update-baseline]
+
+Reports documents/s, rows/s, best wall time and peak memory per parser. Exits non-zero when a parser
+fails or has no fixtures, or one is slower or uses more memory than benchmarks/baseline.json by more than the threshold,
+measured twice.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from urllib.parse import unquote, urlparse
+from zipfile import ZipFile
+
+import pandas as pd
+
+import scraper
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+INDEX = FIXTURES / 'index.json'
+BASELINE = Path(__file__).parent / 'baseline.json'
+# Fast parsers are run again until this many seconds have passed, so their best time isn't one lucky run.
+MIN_SECONDS = 2.0
+
+### Parsers ###
+def parse_indiana(url):
+    x = scraper.Indiana(datetime.strptime(url.split('/')[-1][:7], '%Y-%m'))
+    return [x.clean_gaming(), x.clean_sports_betting()]
+
+def parse_connecticut_sports(url):
+    sub_category = 'Retail' if urlparse(url).path == urlparse(scraper.ConnecticutSports.retail_url).path else 'Online'
+    return [scraper.ConnecticutSports(url, sub_category).clean()]
+
+# Parser name: url -> list of dataframes. Illinois is a form post, not a file, so it has no fixtures.
+PARSERS = {
+    'Arizona': lambda url: [scraper.Arizona(url).clean()],
+    'ConnecticutGaming': lambda url: [scraper.ConnecticutGaming(url).clean()],
+    'ConnecticutSports': parse_connecticut_sports,
+    'Indiana': parse_indiana,
+    'Iowa': lambda url: [x.clean() for x in scraper.Iowa.parse_pdf(url)],
+    'Kansas': lambda url: [scraper.Kansas(url).clean()],
+    'Maryland': lambda url: [scraper.Maryland(url).clean()],
+    'MichiganRetailSports': lambda url: [scraper.MichiganRetailSports(url).clean()],
+    'MichiganOnlineSports': lambda url: [scraper.MichiganOnlineSports(url).clean()],
+    'MichiganGaming': lambda url: [scraper.MichiganGaming(url, 0).clean()],
+    'NewJerseyGaming': lambda url: [scraper.NewJerseyGaming(url).clean()],
+    'NewJerseySports': lambda url: [scraper.NewJerseySports(url).clean()],
+    'NewYork': lambda url: [scraper.NewYork(url).clean()],
+    'PennsylvaniaGaming': lambda url: [scraper.PennsylvaniaGaming(url).clean()],
+    'PennsylvaniaSports': lambda url: [scraper.PennsylvaniaSports(url).clean()],
+    'WestVirginiaGaming': lambda url: [scraper.WestVirginiaGaming(ZipFile(BytesIO(scraper.fetch(url)))).clean()],
+    'WestVirginiaSports': lambda url: [scraper.WestVirginiaSports(ZipFile(BytesIO(scraper.fetch(url)))).clean()],
+}
+
+### Fixtures ###
+def fixture_path(url):
+    """ Where a url is recorded. Query strings are not part of the path. """
+    parts = urlparse(url)
+    return FIXTURES / parts.netloc / unquote(parts.path).lstrip('/')
+
+def load_index():
+    return json.loads(INDEX.read_text()) if INDEX.exists() else {}
+
+def record(name, urls):
+    """ Download urls from the live sites into the fixtures of a parser. """
+    index = load_index()
+    for url in urls:
+        response = scraper.http_get(url)
+        response.raise_for_status()
+        path = fixture_path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(response.content)
+        print(f'Recorded {url} -> {path.relative_to(FIXTURES)}')
+        if url not in index.setdefault(name, []):
+            index[name].append(url)
+    INDEX.write_text(json.dumps(index, indent=2) + '\n')
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@contextmanager
+def serve(folder):
+    """ Serve folder over HTTP on a free local port, yielding its base url. """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=str(folder)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+### Measurement ###
+def run(parse, urls):
+    """ Parse every url, with no NJ regions learned, so the first report of a layout is read with camelot. Returns the number of rows. """
+    scraper.NewJersey.regions_path.unlink(missing_ok=True)
+    return sum(len(df) for url in urls for df in parse(url) if df is not None)
+
+def measure(parse, urls, runs):
+    """ 
+    Best wall time of at least runs, and of as many as fit in MIN_SECONDS, then peak traced memory of another,
+    since tracing slows parsing down.
+    """
+    seconds, done, began = float('inf'), 0, perf_counter()
+    while done < runs or perf_counter() - began < MIN_SECONDS:
+        start = perf_counter()
+        rows = run(parse, urls)
+        seconds = min(seconds, perf_counter() - start)
+        done += 1
+    # Garbage left by the timed runs would otherwise be freed at a different point of every traced run.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(parse, urls)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'documents': len(urls), 'rows': rows, 'seconds': round(seconds, 4),
+            'documents/s': round(len(urls) / seconds, 2), 'rows/s': round(rows / seconds, 1),
+            'peak_mb': round(peak / 1024 ** 2, 2)}
+
+def regressions(results, baseline, threshold):
+    """ Messages for every wall time or peak memory above the baseline by more than threshold. """
+    found = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in ['seconds', 'peak_mb']:
+            if result[metric] > base[metric] * (1 + threshold):
+                found.append(f'{name} {metric}: {base[metric]} -> {result[metric]} (+{result[metric] / base[metric] - 1:.0%})')
+    return found
+
+def main(names, runs, threshold, update_baseline):
+    index = load_index()
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    results, failures = {}, []
+    with TemporaryDirectory() as temp, serve(FIXTURES) as mirror:
+        os.environ['SCRAPER_MIRROR'] = mirror
+        scraper.CACHE_FOLDER = Path(temp) / 'http'
+        scraper.NewJersey.regions_path = Path(temp) / 'regions.json'
+        for name in names:
+            urls = index.get(name, [])
+            if not urls:
+                failures.append(f'{name} has no fixtures, record some with --record {name} <url> or run benchmarks.synthetic')
+                continue
+            # Downloads from the stand-in are not part of the measurement.
+            missing = set(urls) - set(scraper.fetch_all(urls))
+            if missing:
+                failures.append(f'{name} fixtures missing: {", ".join(sorted(missing))}')
+                continue
+            try:
+                results[name] = measure(PARSERS[name], urls, runs)
+                # A regression is measured again before it counts, in case the machine was busy.
+                if not update_baseline and regressions({name: results[name]}, baseline, threshold):
+                    results[name] = min(results[name], measure(PARSERS[name], urls, runs), key=lambda x: x['seconds'])
+            except Exception as e:
+                failures.append(f'{name} failed: {e!r}')
+    if results:
+        print(pd.DataFrame(results).T.to_string())
+    else:
+        failures.append(f'No parser ran out of {", ".join(names)}')
+    if update_baseline:
+        BASELINE.write_text(json.dumps({**baseline, **results}, indent=2) + '\n')
+        print(f'Updated {BASELINE.name}')
+        return failures
+    return failures + regressions(results, baseline, threshold)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('names', nargs='*', default=list(PARSERS), help=f'Parsers to run: {", ".join(PARSERS)}')
+    parser.add_argument('--record', nargs='+', metavar=('PARSER', 'URL'), help='Record urls as fixtures of a parser, then exit.')
+    parser.add_argument('--runs', type=int, default=5, help='Fewest runs to take the best wall time of.')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed fraction above the baseline.')
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+    if args.record:
+        record(args.record[0], args.record[1:])
+        sys.exit()
+    problems = main(args.names, args.runs, args.threshold, args.update_baseline)
+    for problem in problems:
+        print(problem)
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,68 @@
+"""
+Startup benchmark: how long `import scraper` takes, and which heavy libraries it loads.
+
+Every run imports scraper in a fresh interpreter with -X importtime, as each state process and pool worker does.
+Heavy backends (camelot, selenium, ...) should only be imported by the states which use them.
+
+    poetry run python -m benchmarks.startup [--runs 5] [--threshold 0.25] [--update-baseline]
+
+Reports the best import time and the slowest direct imports. Exits non-zero when a heavy backend is
+imported at startup, or the import is slower than benchmarks/baseline.json by more than the threshold.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+BASELINE = Path(__file__).parent / 'baseline.json'
+NAME = 'import scraper'
+HEAVY = ['camelot', 'cv2', 'selenium', 'pypdfium2', 'PyPDF2', 'openpyxl', 'bs4', 'matplotlib']
+CHECK = f'import json, sys, scraper; print(json.dumps([x for x in {HEAVY!r} if x in sys.modules]))'
+
+def import_once():
+    """ Import scraper in a new interpreter. Returns (seconds, {direct import: seconds}, heavy modules loaded). """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHECK], cwd=ROOT, capture_output=True, text=True, check=True)
+    # Lines are 'import time: self | cumulative | name', nested two spaces a level, children before their parent.
+    entries = []
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('imported package'):
+            _, cumulative, name = line[len('import time:'):].split('|')
+            entries.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative) / 1e6))
+    index = next(i for i, (depth, name, _) in enumerate(entries) if depth == 1 and name == 'scraper')
+    children = {}
+    for depth, name, seconds in reversed(entries[:index]):
+        if depth == 1:
+            break
+        if depth == 3:
+            children[name] = seconds
+    return entries[index][2], children, json.loads(result.stdout)
+
+def main(runs, threshold, update_baseline):
+    results = [import_once() for _ in range(runs)]
+    seconds, children, heavy = min(results, key=lambda x: x[0])
+    print(f'{NAME}: {seconds:.3f}s (best of {runs})')
+    for name, child in sorted(children.items(), key=lambda x: -x[1])[:8]:
+        print(f'  {name:<32} {child:.3f}s')
+    problems = [f'{NAME} loads {x} at startup' for x in sorted({x for result in results for x in result[2]})]
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    if update_baseline:
+        baseline[NAME] = {'seconds': round(seconds, 3)}
+        BASELINE.write_text(json.dumps(baseline, indent=2) + '\n')
+        print(f'Updated {BASELINE.name}')
+    elif NAME in baseline and seconds > baseline[NAME]['seconds'] * (1 + threshold):
+        base = baseline[NAME]['seconds']
+        problems.append(f'{NAME} seconds: {base} -> {seconds:.3f} (+{seconds / base - 1:.0%})')
+    return problems
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Imports to take the best time of.')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed fraction above the baseline.')
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+    problems = main(args.runs, args.threshold, args.update_baseline)
+    for problem in problems:
+        print(problem)
+    sys.exit(1 if problems else 0)
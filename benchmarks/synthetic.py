@@ -0,0 +1,435 @@
+"""
+Synthetic fixtures for the offline parser benchmarks, shaped like the reports each parser reads.
+
+Recorded reports can't always be shared, so these give every listed parser something to read without the live sites.
+Values come from a seeded generator, so regenerating them gives the same numbers.
+
+    poetry run python -m benchmarks.synthetic
+
+Writes benchmarks/fixtures/<host>/<path> and adds the urls to benchmarks/fixtures/index.json.
+"""
+import json
+import random
+from datetime import date, timedelta
+from io import BytesIO
+from zipfile import ZIP_DEFLATED, ZipFile
+
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from openpyxl import Workbook
+
+import scraper
+from benchmarks.parsers import FIXTURES, INDEX, fixture_path, load_index
+
+YEAR = 2023
+rng = random.Random(2023)
+
+def money(low, high):
+    """ A report style dollar amount. Negatives are in accounting parentheses. """
+    value = rng.randint(low, high) + rng.randint(0, 99) / 100
+    return f'$({-value:,.2f})' if value < 0 else f'${value:,.2f}'
+
+def write(url, content):
+    path = fixture_path(url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    print(f'Wrote {url} -> {path.relative_to(FIXTURES)}')
+    return url
+
+def workbook_bytes(workbook):
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+### PDF ###
+def pdf_bytes(pages, rules=None):
+    """ 
+    A minimal PDF of Helvetica text. pages are lists of (x, y, size, text), in points from the bottom left.
+
+    rules are lists of (x1, y1, x2, y2) lines for every page, drawn as table borders.
+    """
+    objects = [b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    # Font, then a content stream and a page for every page, then the page tree and catalog.
+    tree = 2 * len(pages) + 2
+    kids = []
+    for items, lines in zip(pages, rules or [[]] * len(pages)):
+        escaped = [(x, y, size, text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')) for x, y, size, text in items]
+        stream = ''.join(f'{x1} {y1} m {x2} {y2} l S\n' for x1, y1, x2, y2 in lines).encode()
+        stream += ''.join(f'BT /F1 {size} Tf {x} {y} Td ({text}) Tj ET\n' for x, y, size, text in escaped).encode()
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'endstream')
+        objects.append(f'<< /Type /Page /Parent {tree} 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R '
+                       f'/Resources << /Font << /F1 1 0 R >> >> >>'.encode())
+        kids.append(f'{len(objects)} 0 R')
+    objects.append(f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(pages)} >>'.encode())
+    objects.append(f'<< /Type /Catalog /Pages {tree} 0 R >>'.encode())
+    out, offsets = b'%PDF-1.4\n', []
+    for idx, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{idx} 0 obj\n'.encode() + obj + b'\nendobj\n'
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    out += b''.join(f'{x:010d} 00000 n \n'.encode() for x in offsets)
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root {len(objects)} 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return out
+
+### New Jersey ###
+NJ_CASINOS = ['Bally\'s Atlantic City', 'Borgata Hotel Casino & Spa', 'Caesars Interactive NJ', 'Golden Nugget',
+              'Hard Rock Hotel & Casino', 'Harrah\'s Resort', 'Ocean Casino Resort', 'Resorts Casino Hotel',
+              'Tropicana Casino & Resort']
+# Tables of a page, top down, as (title, [row labels]). Values are right aligned in the last column.
+NJ_TABLES = {
+    'NewJerseyGaming': [('Internet Gaming Win', ['Peer-to-Peer (Poker)', 'Other Authorized Games', 'Total Internet Gaming Win']),
+                        ('Internet Gaming Tax', ['Gross Revenue Tax (15%)'])],
+    'NewJerseySports': [('Retail Sports Wagering', ['Wagers', 'Amounts Paid', 'Gross Revenue']),
+                        ('Retail Tax', ['Tax Due (8.5%)']),
+                        ('Online Sports Wagering', ['Wagers', 'Amounts Paid', 'Gross Revenue'])],
+}
+NJ_TITLES = {'NewJerseyGaming': 'MONTHLY INTERNET GROSS REVENUE REPORT', 'NewJerseySports': 'MONTHLY SPORTS WAGERING TAX RETURN'}
+
+def table(left, top, rows, widths, size=10, leading=None):
+    """ 
+    Text and ruling lines of a table with rows of cells, top down. The first cell of a row is left aligned, the rest right aligned.
+
+    A cell of several lines, split by newlines, makes its row taller.
+    """
+    leading = leading or 2.4 * size
+    edges = [left + sum(widths[:idx]) for idx in range(len(widths) + 1)]
+    items, tops = [], [top]
+    for row in rows:
+        lines = max(len(cell.split('\n')) for cell in row)
+        for col, cell in enumerate(row):
+            for idx, text in enumerate(cell.split('\n')):
+                y = tops[-1] - (idx + 1) * leading + 0.8 * size
+                x = edges[col] + 0.6 * size if col == 0 else edges[col + 1] - 0.6 * size - 0.56 * size * len(text)
+                items.append((round(x, 1), round(y, 1), size, text))
+        tops.append(tops[-1] - lines * leading)
+    rules = [(edges[0], y, edges[-1], y) for y in tops] + [(x, top, x, tops[-1]) for x in edges]
+    return items, rules
+
+def newjersey_page(name, casino):
+    """ Text and ruling lines of a casino's page: its header, title, then a table per NJ_TABLES with fresh values. """
+    items, rules = [(72, 740, 12, casino.upper()), (72, 720, 12, NJ_TITLES[name])], []
+    top = 680
+    for title, labels in NJ_TABLES[name]:
+        rows = [(title, 'Current Month'), *[(label, money(-50_000, 5_000_000)) for label in labels]]
+        cells, lines = table(72, top, rows, [330, 150])
+        items, rules = items + cells, rules + lines
+        top -= 24 * len(rows) + 36
+    return items, rules
+
+def newjersey(name, months):
+    """ A PDF per month with a page per casino, each ruled into tables as camelot reads them. """
+    cls = getattr(scraper, name)
+    urls = []
+    for month in months:
+        pages = [newjersey_page(name, casino) for casino in NJ_CASINOS]
+        urls.append(write(cls.sources[0].format(month=month), pdf_bytes(*zip(*pages))))
+    return urls
+
+### New York ###
+NY_PROVIDERS = ['BallyBet', 'BetMGM', 'BetRivers', 'Caesars', 'DraftKings', 'FanDuel', 'Resorts World', 'WynnBET']
+
+def newyork():
+    """ A workbook per provider, with a sheet per fiscal year of weekly GGR. """
+    urls = []
+    for provider in NY_PROVIDERS:
+        workbook = Workbook()
+        workbook.remove(workbook.active)
+        for fiscal_year in range(2022, 2025):
+            sheet = workbook.create_sheet(f'FY {fiscal_year - 1}-{fiscal_year % 100}')
+            sheet.append([f'{provider} Mobile Sports Wagering Report'])
+            sheet.append([])
+            sheet.append(['Fiscal Year', 'Month Ending', 'Week Ending', 'Handle', 'GGR'])
+            week = date(fiscal_year - 1, 4, 3)
+            while week < date(fiscal_year, 4, 1):
+                sheet.append([f'FY {fiscal_year}', week.replace(day=1), week, rng.randint(1_000_000, 90_000_000), rng.randint(-500_000, 9_000_000)])
+                week += timedelta(weeks=1)
+            sheet.append(['Total', None, None, None, None])
+        url = f'https://www.gaming.ny.gov/pdf/Mobile%20Sports%20Wagering%20Report%20{provider.replace(" ", "%20")}.xlsx'
+        urls.append(write(url, workbook_bytes(workbook)))
+    return urls
+
+### Pennsylvania ###
+PA_PROVIDERS = ['BetMGM', 'Borgata Online', 'DraftKings', 'FanDuel', 'Hollywood Casino', 'Rivers Casino', 'Valley Forge']
+
+def pennsylvania(name, sections, totals):
+    """
+    A fiscal year workbook: a block of rows per provider, months across and totals at the end.
+
+    sections are [(section label, [field labels])], the first section label sits under the provider name.
+    """
+    cls = getattr(scraper, name)
+    months = [f'{date(YEAR - 1 + (month < 7), month, 1):%B %Y}' for month in [*range(7, 13), *range(1, 7)]]
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append([f'Pennsylvania Gaming Control Board - {cls.category}'])
+    sheet.append([f'Fiscal Year {YEAR - 1}/{YEAR}'])
+    sheet.append([])
+    sheet.append(['', *months, *totals])
+    for provider in PA_PROVIDERS:
+        sheet.append([provider])
+        for section, fields in sections:
+            sheet.append([section])
+            for field in fields:
+                values = [rng.randint(-100_000, 40_000_000) for _ in months]
+                sheet.append([field, *values, *[sum(values)] * len(totals)])
+        sheet.append([])
+    return [write(cls.sources[0].format(year=YEAR - 1, next_year=YEAR), workbook_bytes(workbook))]
+
+### West Virginia ###
+def westvirginia(name, header_rows, header, highs):
+    """ A zip of a workbook per month, every sheet a casino with a row per week: the week ending date, then values up to highs. """
+    cls = getattr(scraper, name)
+    archive = BytesIO()
+    with ZipFile(archive, 'w', ZIP_DEFLATED) as zipfile:
+        for month in range(1, 13):
+            workbook = Workbook()
+            workbook.remove(workbook.active)
+            for casino in cls.sheetnames:
+                sheet = workbook.create_sheet(casino)
+                for _ in range(header_rows):
+                    sheet.append([f'{casino} {cls.link_text}'])
+                sheet.append(header)
+                week = date(YEAR, month, 1) + timedelta(days=(6 - date(YEAR, month, 1).weekday()) % 7)
+                while week.month == month:
+                    sheet.append([f'{week:%m/%d/%Y}', *[rng.randint(0, high * 100) / 100 for high in highs]])
+                    week += timedelta(weeks=1)
+                sheet.append(['Total*', *[None] * (len(header) - 1)])
+            zipfile.writestr(f'{cls.link_text} {YEAR}-{month:02}.xlsx', workbook_bytes(workbook))
+    url = f'https://wvlottery.com/wp-content/uploads/{YEAR}/12/{cls.link_text.replace(" ", "-")}-{YEAR}.zip'
+    return [write(url, archive.getvalue())]
+
+### Connecticut ###
+def connecticut(url, columns):
+    """ A data.ct.gov CSV export of monthly rows by licensee. """
+    months = pd.date_range(f'{YEAR - 2}-01-01', f'{YEAR}-12-01', freq='MS') + pd.offsets.MonthEnd(0)
+    licensees = ['DraftKings', 'FanDuel', 'Fanatics']
+    rows = [{'Month Ending': f'{month:%m/%d/%Y}', 'Licensee': licensee, **{x: money(-100_000, 50_000_000) for x in columns}}
+            for month in months for licensee in licensees]
+    return [write(url, pd.DataFrame(rows).to_csv(index=False).encode())]
+
+### Arizona ###
+AZ_PROVIDERS = ['Arizona Cardinals', 'Arizona Coyotes', 'Arizona Diamondbacks', 'Phoenix Mercury', 'Phoenix Suns', 'TPC Scottsdale',
+                'Tonto Apache Tribe', 'Yavapai-Apache Nation']
+
+def arizona(months):
+    """ A text PDF per month: a title, then a line per provider of Retail and Online values interleaved, then the totals. """
+    urls = []
+    for month in months:
+        lines = [f'Event Wagering Revenue Report - {month:%B %Y}']
+        lines += [f'{provider} {" ".join(money(-100_000, 90_000_000) for _ in range(scraper.Arizona.width))}' for provider in AZ_PROVIDERS]
+        lines.append(' '.join(money(0, 500_000_000) for _ in range(scraper.Arizona.width)))
+        page = [(36, 750 - idx * 14, 7, line) for idx, line in enumerate(lines)]
+        urls.append(write(scraper.Arizona.sources[1].format(month=month), pdf_bytes([page])))
+    return urls
+
+### Indiana ###
+IN_CASINOS = ['Ameristar Casino', 'Belterra Casino Resort', 'Blue Chip Casino', 'Caesars Southern Indiana', 'Hard Rock Casino Northern Indiana',
+              'Hard Rock Casino Northern Indiana', 'Harrah\'s Hoosier Park', 'Horseshoe Indianapolis', 'Tropicana Evansville']
+IN_SPORTS = {'Ameristar Casino': ['DraftKings', 'BetMGM'], 'Blue Chip Casino': ['BetRivers', 'Caesars Sportsbook', 'FanDuel'],
+             'Horseshoe Indianapolis': ['Caesars Sportsbook'], 'Harrah\'s Hoosier Park': ['Barstool', 'Fanatics']}
+
+def indiana(months):
+    """ 
+    A workbook per month. The first sheet is casinos in three blocks of columns stacked on top of each other, each ending in a TOTAL row.
+
+    The last sheet is sports wagering, three columns of providers side by side, each provider a block of its sub-providers.
+    """
+    urls = []
+    for month in months:
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = 'Casinos'
+        sheet.append(['Indiana Gaming Commission'])
+        sheet.append([f'Casino Revenue - {month:%B %Y}'])
+        sheet.append([])
+        sheet.append(['TOTAL TAX', 'Location', 'Win', 'Free Play', 'Other *', 'Taxable AGR'])
+        for casino in IN_CASINOS:
+            sheet.append([casino, 'Indiana', *[rng.randint(0, 30_000_000) for _ in range(4)]])
+        sheet.append(['TOTAL', None, *[rng.randint(0, 200_000_000) for _ in range(4)]])
+        # Table wins are left blank under the first row of a casino with two.
+        sheet.append(['Casino', 'Location', 'Table Win', 'EGD/Slot Win', 'Poker Win', 'Total Win'])
+        for idx, casino in enumerate(IN_CASINOS):
+            repeated = idx > 0 and IN_CASINOS[idx - 1] == casino
+            sheet.append([casino, 'Indiana', None if repeated else rng.randint(0, 9_000_000), *[rng.randint(0, 20_000_000) for _ in range(3)]])
+        sheet.append(['TOTAL', None, *[rng.randint(0, 200_000_000) for _ in range(4)]])
+        # Taxes are by licence, so the casino with two rows above has one here.
+        sheet.append(['WAGERING TAX', 'AGR', 'Wagering Tax Due', 'Supplemental Tax', 'Tax Paid', 'Admissions'])
+        for casino in dict.fromkeys(IN_CASINOS):
+            sheet.append([casino, *[rng.randint(0, 20_000_000) for _ in range(5)]])
+        sheet.append(['TOTAL', *[rng.randint(0, 200_000_000) for _ in range(5)]])
+        sports = workbook.create_sheet('Sports Wagering')
+        for _ in range(3):
+            sports.append([f'Sports Wagering - {month:%B %Y}'])
+        sports.append([*['Casino', None, f'{month:%B}', f'{month:%B}', None] * 3][:-1])
+        parts = [[], [], []]
+        for idx, (provider, sub_providers) in enumerate(IN_SPORTS.items()):
+            part = parts[idx % len(parts)]
+            part.append([provider, None, 'Handle', 'AGR'])
+            part += [[sub, None, rng.randint(100_000, 90_000_000), rng.randint(-500_000, 9_000_000)] for sub in sub_providers]
+            part.append(['Adjustments', None, rng.randint(-50_000, 0), rng.randint(-50_000, 0)])
+            part.append(['Taxable AGR', None, None, rng.randint(0, 9_000_000)])
+            part.append([None, None, 'Tax Due', rng.randint(0, 900_000)])
+        for idx in range(max(len(part) for part in parts)):
+            row = []
+            for part in parts:
+                row += [*(part[idx] if idx < len(part) else [None] * 4), None]
+            sports.append(row[:-1])
+        urls.append(write(scraper.Indiana.get_url(month), workbook_bytes(workbook)))
+    return urls
+
+### Iowa ###
+IA_CASINOS = ['Ameristar II', 'Catfish Bend', 'Diamond Jo Dubuque', 'Diamond Jo Worth', 'Grand Falls', 'Hard Rock Sioux City', 
+              'Harrah\'s Council Bluffs', 'Horseshoe Council Bluffs', 'Isle Bettendorf', 'Prairie Meadows', 'Rhythm City', 'Wild Rose Emmetsburg']
+IA_FIELDS = {'Retail': ['CASINO', 'SPORTS WAGERING NET RECEIPTS', 'SPORTS WAGERING HANDLE', 'SPORTS WAGERING PAYOUTS', 'STATE TAX'],
+             'Online': ['CASINO', 'INTERNET NET RECEIPTS', 'INTERNET HANDLE', 'INTERNET PAYOUTS']}
+IA_TITLES = {'Retail': 'SPORTS WAGERING REVENUE', 'Online': 'ONLINE SPORTS WAGERING'}
+
+def iowa(months):
+    """ A PDF per month, a page per sub-category: fields down the rows and casinos across, in blocks of four casinos. """
+    urls = []
+    for month in months:
+        pages, rules = [], []
+        for sub_category, fields in IA_FIELDS.items():
+            rows = []
+            for idx in range(0, len(IA_CASINOS), 4):
+                casinos = IA_CASINOS[idx:idx + 4]
+                rows.append([fields[0], *casinos])
+                rows += [[field, *[money(-100_000, 9_000_000) for _ in casinos]] for field in fields[1:]]
+            items, lines = table(36, 700, rows, [150, 105, 105, 105, 105], size=7)
+            pages.append([(36, 740, 10, f'{IA_TITLES[sub_category]} - {month:%B %Y}'.upper()), *items])
+            rules.append(lines)
+        url = f'https://irgc.iowa.gov/sites/default/files/documents/{month:%Y}/{month:%m}/sports_wagering_revenue_{month:%B_%Y}.pdf'.lower()
+        urls.append(write(url, pdf_bytes(pages, rules)))
+    return urls
+
+### Kansas ###
+KS_CASINOS = {'Boot Hill Casino': ['DraftKings', 'Fanatics'], 'Hollywood Casino': ['Barstool', 'BetMGM'], 
+              'Kansas Star Casino': ['Caesars', 'FanDuel'], 'Kansas Crossing Casino': ['BetRivers']}
+
+def kansas(months):
+    """ 
+    A PDF per month, one table of retail then online rows by casino and provider, each ending in a Subtotal. 
+
+    The grand total is a cell of several lines, as camelot reads the merged last row.
+    """
+    urls = []
+    header = ['Casino', 'Provider', 'Settled Wagers', 'Revenues', 'State Share']
+    for month in months:
+        rows = [header]
+        for sub_category in ['Retail', 'Online']:
+            # Retail books are the casino's first partner.
+            rows += [[casino, provider, *[money(-100_000, 90_000_000) for _ in range(3)]]
+                     for casino, providers in KS_CASINOS.items() for provider in providers[:1 if sub_category == 'Retail' else None]]
+            rows.append([f'{sub_category} Subtotal', '', *[money(0, 300_000_000) for _ in range(3)]])
+        rows.append(['Grand\nTotal\n' + '\n'.join(money(0, 600_000_000) for _ in range(3)), '', '', '', ''])
+        items, lines = table(36, 720, rows, [130, 90, 110, 110, 100], size=8)
+        url = f'https://kslottery.com/media/sports-wagering-revenues-{month:%Y-%m}.pdf'
+        urls.append(write(url, pdf_bytes([items], [lines])))
+    return urls
+
+### Maryland ###
+MD_RETAIL = ['BetMGM Sportsbook National Harbor', 'Caesars Sportsbook Horseshoe Baltimore', 'Live! Casino & Hotel', 'Maryland Stadium Sub', 'Ocean Downs Casino']
+MD_ONLINE = ['BetMGM', 'BetRivers', 'Caesars Sportsbook', 'DraftKings', 'FanDuel', 'Fanatics']
+
+def maryland(months):
+    """ A workbook per month: retail licensees then mobile ones, each followed by a Combined row. """
+    urls = []
+    for month in months:
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['Maryland Lottery and Gaming'])
+        sheet.append([f'Sports Wagering Data - {month:%B %Y}'])
+        sheet.append([])
+        sheet.append([None, 'Licensee', None, None, 'Promotion', 'Other', 'Deductions', None])
+        for licensees in [MD_RETAIL, MD_ONLINE]:
+            if licensees is MD_ONLINE:
+                sheet.append([None, 'Mobile Licensee', 'Handle', 'Prizes Paid', 'Promotion', 'Other', 'Deductions', 'Taxable Win'])
+            for licensee in [*licensees, 'Combined']:
+                sheet.append([None, licensee, *[rng.randint(-100_000, 90_000_000) for _ in range(6)]])
+        upload = month + relativedelta(months=1)
+        urls.append(write(scraper.Maryland.sources[0].format(upload=upload, month=month), workbook_bytes(workbook)))
+    return urls
+
+### Michigan ###
+MI_CASINOS = [('MGM Grand Detroit', 'BetMGM', 'BetMGM'), ('MotorCity Casino', 'FanDuel', 'FanDuel'), ('Greektown Casino', 'PENN Sports', 'Barstool'),
+              ('Bay Mills Indian Community', 'Rush Street', 'BetRivers'), ('Little River Casino', 'DraftKings', 'DraftKings')]
+MI_MONTHS = [f'{date(YEAR, month, 1):%B}' for month in range(1, 13)]
+
+def michigan_workbook(name, totals):
+    """ 
+    A workbook of the year, as Michigan publishes online sports and iGaming: three header rows of operators, casinos and platforms
+    over a block of columns each, the field names repeated for every block, then a row per month and a Totals row.
+    """
+    cls = getattr(scraper, name)
+    jump = len(cls.fields)
+    width = 1 + jump * len(MI_CASINOS) + totals
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['Michigan Gaming Control Board', f'{YEAR} {cls.category} Revenues'])
+    for idx in range(3):
+        row = [None] * width
+        for block, names in enumerate(MI_CASINOS):
+            row[1 + block * jump] = names[idx]
+        sheet.append(row)
+    sheet.append([])
+    sheet.append(['Month', *cls.fields * len(MI_CASINOS), *['Total'] * totals])
+    for month in [*MI_MONTHS, 'Totals*']:
+        sheet.append([month, *[rng.randint(1, 40_000_000) for _ in range(width - 1)]])
+    url = f'https://www.michigan.gov/mgcb/-/media/Project/Websites/mgcb/Revenues/{YEAR}-{name}-Revenues.xlsx'
+    return [write(url, workbook_bytes(workbook))]
+
+def michigan_retail():
+    """ A PDF of the year's retail sports, one ruled table: the year, casinos over their blocks, the field names, then the months. """
+    jump = len(scraper.MichiganRetailSports.fields)
+    casinos = [x[0].split()[0] for x in MI_CASINOS[:3]]
+    blank = [''] * (jump - 1)
+    rows = [['Retail', str(YEAR), *[''] * (jump * len(casinos) - 1), ''],
+            ['', *[x for casino in casinos for x in [casino, *blank]], ''],
+            ['Month', *['Handle', 'Gross', 'AGR', 'Tax'] * len(casinos), 'Total']]
+    rows += [[month, *[f'{rng.randint(0, 999_999):,}' for _ in range(jump * len(casinos) + 1)]] for month in [*MI_MONTHS, 'Totals']]
+    items, lines = table(36, 740, rows, [48] + [40] * (jump * len(casinos) + 1), size=6)
+    url = f'https://www.michigan.gov/mgcb/-/media/Project/Websites/mgcb/Revenues/{YEAR}-Retail-Sports-Betting-Revenues.pdf'
+    return [write(url, pdf_bytes([items], [lines]))]
+
+def main():
+    index = load_index()
+    months = [date(YEAR, month, 1) for month in range(1, 4)]
+    fixtures = {}
+    for name in ['NewJerseyGaming', 'NewJerseySports']:
+        fixtures[name] = newjersey(name, months)
+    fixtures['Arizona'] = arizona(months)
+    fixtures['Indiana'] = indiana(months)
+    fixtures['Iowa'] = iowa(months)
+    fixtures['Kansas'] = kansas(months)
+    fixtures['Maryland'] = maryland(months)
+    fixtures['MichiganRetailSports'] = michigan_retail()
+    fixtures['MichiganOnlineSports'] = michigan_workbook('MichiganOnlineSports', 1)
+    fixtures['MichiganGaming'] = michigan_workbook('MichiganGaming', 2)
+    fixtures['NewYork'] = newyork()
+    fixtures['PennsylvaniaGaming'] = pennsylvania('PennsylvaniaGaming', [
+        ('Interactive Slots', ['Wagers Received', 'Amount Won', 'Gross Revenue']),
+        ('Interactive Banking Tables', ['Wagers Received', 'Gross Revenue']),
+        ('Interactive Non-Banking Tables (Poker)', ['Revenue (Rake & Tournament Fees)']),
+    ], ['FY Total'])
+    fixtures['PennsylvaniaSports'] = pennsylvania('PennsylvaniaSports', [
+        ('Total Sports Wagering', ['Handle', 'Revenue', 'Promotional Credits', 'Gross Revenue (Taxable)']),
+        ('Retail Sports Wagering*', ['Handle', 'Revenue']),
+        ('Online Sports Wagering', ['Handle', 'Revenue', 'Promotional Credits', 'Gross Revenue (Taxable)']),
+    ], ['FY Total', 'Prior FY Total', 'Change'])
+    fixtures['WestVirginiaGaming'] = westvirginia('WestVirginiaGaming', 2, ['Week Ending', 'Wagers*', 'Paids*', 'Revenue*'],
+                                                  [5_000_000, 4_800_000, 400_000])
+    sports = ['Gross Tickets Written', 'Voids', 'Tickets Cashed', 'Total Taxable Receipts']
+    fixtures['WestVirginiaSports'] = westvirginia('WestVirginiaSports', 3, ['Week Ending', *[f'{x} {sub}' for sub in ['Retail', 'Online', 'Total'] for x in sports]],
+                                                  [2_000_000, 20_000, 1_800_000, 200_000] * 3)
+    fixtures['ConnecticutGaming'] = connecticut(scraper.ConnecticutGaming.url, [
+        'Wagers', 'Patron Winnings', 'Online Casino Gaming Win/(Loss)', 'Promotional Coupons or Credits Wagered (3)', 'Total Gross Gaming Revenue'])
+    fixtures['ConnecticutSports'] = [url for url in scraper.ConnecticutSports.sources for url in connecticut(url, [
+        'Wagers', 'Patron Winnings', 'Online Sports Wagering Win/(Loss)', 'Unadjusted Monthly Gaming Revenue',
+        'Promotional Coupons or Credits Wagered (5)', 'Total Gross Gaming Revenue'])]
+    for name, urls in fixtures.items():
+        index[name] = [*[x for x in index.get(name, []) if x not in urls], *urls]
+    INDEX.write_text(json.dumps(index, indent=2) + '\n')
+
+if __name__ == '__main__':
+    main()
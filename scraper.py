@@ -1,24 +1,405 @@
+import argparse
+import cProfile
+import hashlib
+import importlib
+import json
+import mmap
+import os
+import pstats
 import re
+import sqlite3
+import sys
+import threading
+import traceback
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from ctypes.util import find_library
+from contextlib import ExitStack, closing, contextmanager, redirect_stderr, redirect_stdout
 from datetime import date, datetime, timedelta
+from functools import partial, wraps
 from io import BytesIO
-from itertools import chain
+from multiprocessing.managers import BaseManager
 from pathlib import Path
-from time import sleep
-from urllib.error import HTTPError
-from urllib.parse import unquote, urljoin
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from time import monotonic, perf_counter, sleep
+from urllib.parse import unquote, urljoin, urlparse
 from zipfile import ZipFile
 
-import camelot
+import numpy as np
 import pandas as pd
-import pypdfium2 as pdfium
 import requests
-from bs4 import BeautifulSoup
 from dateutil.relativedelta import relativedelta
 from dateutil.rrule import MONTHLY, rrule
-from PyPDF2 import PdfReader
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# Rows saved and failed scrapes for the state currently running in this process.
+run_stats = {'rows': 0, 'failures': 0}
+
+### Instrumentation ###
+# Where the time went for the state currently running in this process: seconds and calls by stage,
+# stage seconds and rows by document, bytes downloaded and why documents failed.
+# Stages nest: links include their downloads, and save includes to_numeric.
+run_metrics = {'stages': {}, 'documents': {}, 'bytes': 0, 'failure_reasons': [], 'profiles': [], 'imports': {}}
+metrics_lock = threading.Lock()
+
+def reset_metrics():
+    run_stats.update(rows=0, failures=0)
+    with metrics_lock:
+        run_metrics.update(stages={}, documents={}, bytes=0, failure_reasons=[], profiles=[], imports={})
+
+@contextmanager
+def stage(name, document=None, profile=None):
+    """ 
+    Time a stage, in total and for a document when given. Threads can time stages at once.
+
+    The stage is also profiled when profile (a class or name) was selected for profiling.
+    """
+    start = perf_counter()
+    try:
+        with profiled(profile, name, document):
+            yield
+    finally:
+        seconds = perf_counter() - start
+        with metrics_lock:
+            total = run_metrics['stages'].setdefault(name, {'seconds': 0.0, 'calls': 0})
+            total['seconds'] += seconds
+            total['calls'] += 1
+            if document is not None:
+                times = run_metrics['documents'].setdefault(str(document), {})
+                times[name] = times.get(name, 0.0) + seconds
+
+def timed(name):
+    """ Decorator timing every call of a function as a stage, which can be profiled by the stage name. """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name, profile=name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_rows(document, df):
+    """ Rows a document produced. """
+    with metrics_lock:
+        run_metrics['documents'].setdefault(str(document), {})['rows'] = 0 if df is None else len(df)
+
+def record_failure(document, error):
+    """ Count a failed document, keeping the reason. Threads can record failures at once. """
+    with metrics_lock:
+        run_stats['failures'] += 1
+        run_metrics['failure_reasons'].append({'document': str(document), 'reason': repr(error)})
+
+### Backends ###
+def backend(name):
+    """ 
+    Import a heavy library on first use, timing the import.
+
+    camelot (OpenCV, ghostscript), selenium, pypdfium2, PyPDF2, openpyxl and bs4 are only loaded by the states
+    which use them, so a Connecticut refresh and pool workers which don't read PDFs start quickly.
+    """
+    module = sys.modules.get(name)
+    if module is None:
+        start = perf_counter()
+        with stage('import'):
+            module = importlib.import_module(name)
+        with metrics_lock:
+            run_metrics['imports'][name] = round(perf_counter() - start, 3)
+    return module
+
+### Profiling ###
+# States, classes (with their subclasses) and stage names selected for profiling, and where profiles are written.
+# Set in each source's process by run_source.
+profile_settings = {'targets': set(), 'folder': Path('Profiles'), 'top': 25, 'count': 0, 'active': False}
+
+@contextmanager
+def profiled(target, stage_name, document=None):
+    """ 
+    Profile a block with cProfile and tracemalloc, when target is selected. 
+
+    Writes a pstats file, the top allocations by line and collapsed stacks for flamegraph tools.
+    Profiles don't nest, so only the outermost selected block is profiled. Work done in pool processes is not seen,
+    so states give selected classes no pool (see worker_pool).
+    """
+    if profile_settings['active'] or not is_profiled(target):
+        yield
+        return
+    profile_settings['active'] = True
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    start = perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        seconds = perf_counter() - start
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        profile_settings['active'] = False
+        target = target.__name__ if isinstance(target, type) else target
+        write_profile(profiler, snapshot, f'{target}.{stage_name}', document, seconds, peak)
+
+def is_profiled(target):
+    """ Whether target, a class (or one of its bases) or a name, was selected for profiling. """
+    names = {x.__name__ for x in target.__mro__} if isinstance(target, type) else {target}
+    return bool(names & profile_settings['targets'])
+
+@contextmanager
+def worker_pool(target):
+    """ 
+    A process pool for the work of target, or None while target or its state is profiled.
+
+    Without a pool the work runs in this process, so it shows in the profiles.
+    """
+    if profile_settings['active'] or is_profiled(target):
+        yield None
+        return
+    with ProcessPoolExecutor() as pool:
+        yield pool
+
+def write_profile(profiler, snapshot, label, document, seconds, peak):
+    """ Profile files are numbered in the order they were taken, and recorded in run_metrics for comparison. """
+    profile_settings['count'] += 1
+    folder = profile_settings['folder']
+    folder.mkdir(parents=True, exist_ok=True)
+    name = f"{profile_settings['count']:03d} {label}"
+    if document is not None:
+        name += ' ' + re.sub(r'[^\w.-]+', '_', str(document))[-80:]
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(folder / f'{name}.pstats')
+    allocations = [str(x) for x in snapshot.statistics('lineno')[:profile_settings['top']]]
+    (folder / f'{name}.allocations.txt').write_text(f'Peak {peak / 1024 ** 2:.1f} MiB\n' + '\n'.join(allocations) + '\n')
+    (folder / f'{name}.collapsed').write_text(''.join(f'{stack} {value}\n' for stack, value in collapsed_stacks(stats).items()))
+    with metrics_lock:
+        run_metrics['profiles'].append({'profile': label, 'document': str(document), 'seconds': round(seconds, 3), 
+                                        'peak_mb': round(peak / 1024 ** 2, 1), 'file': name})
+
+def collapsed_stacks(stats, min_seconds=1e-5):
+    """ 
+    {'caller;callee;...': microseconds} rebuilt from cProfile's caller/callee totals.
+
+    cProfile keeps no full stacks, so a function's time is split between its callers by their share of its cumulative time.
+    Paths worth less than min_seconds, and recursion, are cut.
+    """
+    label = lambda func: f'{Path(func[0]).name}:{func[1]}({func[2]})'
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    stacks = {}
+    def walk(func, path, share):
+        _, _, own, total, _ = stats.stats[func]
+        path = path + [label(func)]
+        if own * share >= min_seconds:
+            key = ';'.join(path)
+            stacks[key] = stacks.get(key, 0) + round(own * share * 1e6)
+        for callee, edge_total in callees.get(func, []):
+            callee_total = stats.stats[callee][3]
+            callee_share = share * edge_total / callee_total if callee_total else 0
+            if callee_total * callee_share >= min_seconds and label(callee) not in path:
+                walk(callee, path, callee_share)
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            walk(func, [], 1.0)
+    return stacks
+
+### Networking ###
+BROWSER_HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/99.0.4844.83 Safari/537.36'}
+# Hosts that forbid the default requests User-Agent. Hosts answering 403 are added to HostLimits as they are found.
+browser_hosts = {'wvlottery.com'}
+# Per host limits, so parallel runs don't get throttled by state sites. They hold across the processes of a run.
+HOST_CONCURRENCY = 6
+HOST_INTERVAL = 0.1
+TIMEOUT = (10, 60)
+# Sessions can't be shared with forked worker processes, so they are rebuilt per process.
+http_state = {'pid': None, 'session': None, 'limits': None, 'fresh': {}}
+http_lock = threading.Lock()
+# Host limits served to every source process of an orchestrated run, set by share_host_limits.
+shared_host_limits = None
+
+class HostLimiter:
+    """ Caps concurrent requests to a host, spacing out when each one starts. """
+    def __init__(self, concurrency=HOST_CONCURRENCY, interval=HOST_INTERVAL):
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_start = 0
+
+    def __enter__(self):
+        self.slots.acquire()
+        with self.lock:
+            now = monotonic()
+            wait = self.next_start - now
+            self.next_start = max(self.next_start, now) + self.interval
+        if wait > 0:
+            sleep(wait)
+
+    def __exit__(self, *exc):
+        self.slots.release()
+
+class HostLimits:
+    """ 
+    Limiters by host, and the hosts sent browser headers.
+
+    Orchestrated runs serve one from a HostLimitManager, so the limits hold across all source processes. 
+    Otherwise each process has its own.
+    """
+    def __init__(self):
+        self.limiters = {}
+        self.browser_hosts = set(browser_hosts)
+        self.lock = threading.Lock()
 
+    def acquire(self, host):
+        with self.lock:
+            limiter = self.limiters.setdefault(host, HostLimiter())
+        limiter.__enter__()
+
+    def release(self, host):
+        self.limiters[host].__exit__()
+
+    def needs_browser(self, host):
+        return host in self.browser_hosts
+
+    def add_browser_host(self, host):
+        self.browser_hosts.add(host)
+
+class HostLimitManager(BaseManager):
+    pass
+
+HostLimitManager.register('HostLimits', HostLimits)
+
+def share_host_limits(limits):
+    """ Process pool initializer, using the limits of the orchestrating process. """
+    global shared_host_limits
+    shared_host_limits = limits
+
+@contextmanager
+def host_slot(limits, host):
+    limits.acquire(host)
+    try:
+        yield
+    finally:
+        limits.release(host)
+
+def get_http_state():
+    """ Returns this process's session and host limits, creating them on first use. """
+    with http_lock:
+        if http_state['pid'] != os.getpid():
+            session = requests.Session()
+            # Retry 5xx and timeouts with exponential backoff (0.5s, 1s, 2s).
+            retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504], raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=HOST_CONCURRENCY, max_retries=retries)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            http_state.update(pid=os.getpid(), session=session, limits=shared_host_limits or HostLimits(), fresh={})
+        return http_state
+
+def mirror_url(url):
+    """ 
+    With SCRAPER_MIRROR set, https://<host>/<path> is requested from <mirror>/<host>/<path> instead.
+
+    Used to serve recorded source files to the offline benchmarks.
+    """
+    mirror = os.environ.get('SCRAPER_MIRROR')
+    if not mirror or url.startswith(mirror):
+        return url
+    parts = urlparse(url)
+    return f"{mirror.rstrip('/')}/{parts.netloc}{parts.path}"
+
+def http_request(method, url, **kwargs):
+    """ 
+    Request through the shared session, respecting per host limits.
+
+    Hosts that answer 403 are remembered and sent a browser User-Agent from then on.
+    """
+    url = mirror_url(url)
+    host = urlparse(url).netloc
+    state = get_http_state()
+    limits = state['limits']
+    headers = {**(BROWSER_HEADERS if limits.needs_browser(host) else {}), **kwargs.pop('headers', {})}
+    with host_slot(limits, host), stage('download', url):
+        response = state['session'].request(method, url, headers=headers, timeout=TIMEOUT, **kwargs)
+    with metrics_lock:
+        run_metrics['bytes'] += len(response.content)
+    # Forbidden request, try more valid user header.
+    if response.status_code == 403 and not limits.needs_browser(host):
+        limits.add_browser_host(host)
+        return http_request(method, url, headers=headers, **kwargs)
+    return response
+
+def http_get(url, **kwargs):
+    return http_request('GET', url, **kwargs)
+
+### Download cache ###
+# Published reports rarely change, so downloads are kept on disk and revalidated with conditional requests.
+CACHE_FOLDER = Path('.cache') / 'http'
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+def cache_entry(url):
+    """ Path to the metadata kept for a url. """
+    key = hashlib.sha256(url.encode()).hexdigest()
+    return CACHE_FOLDER / 'urls' / f'{key}.json'
+
+def write_atomic(path, content):
+    """ Write to a temp file and rename, so other threads and processes never see partial files. """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(dir=path.parent, delete=False) as temp:
+        temp.write(content)
+    os.replace(temp.name, path)
+
+def evict_cache(max_bytes=CACHE_MAX_BYTES):
+    """ Remove least recently used downloads until the cache fits in max_bytes. """
+    objects = [(x.stat().st_mtime, x.stat().st_size, x) for x in (CACHE_FOLDER / 'objects').iterdir()]
+    total = sum(size for _, size, _ in objects)
+    for _, size, path in sorted(objects):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+def fetch_path(url):
+    """ 
+    Download a url through the cache, returning the path of the cached file.
+
+    Files are stored by content hash, keeping the url's extension (camelot only reads .pdf paths).
+    Cached files are revalidated with If-None-Match/If-Modified-Since, so unchanged reports cost a 304.
+    """
+    # Already downloaded or revalidated by this process.
+    fresh = get_http_state()['fresh']
+    if url in fresh and fresh[url].exists():
+        return fresh[url]
+    entry = cache_entry(url)
+    meta = json.loads(entry.read_text()) if entry.exists() else {}
+    cached = CACHE_FOLDER / 'objects' / meta['file'] if meta else None
+    headers = {}
+    if cached and cached.exists():
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+    response = http_get(url, headers=headers)
+    if response.status_code == 304 and headers:
+        # Mark as recently used.
+        cached.touch()
+        fresh[url] = cached
+        return cached
+    response.raise_for_status()
+    file = hashlib.sha256(response.content).hexdigest() + Path(urlparse(url).path).suffix.lower()
+    path = CACHE_FOLDER / 'objects' / file
+    if path.exists():
+        path.touch()
+    else:
+        write_atomic(path, response.content)
+    meta = {'url': url,
+            'file': file,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')}
+    write_atomic(entry, json.dumps(meta).encode())
+    evict_cache()
+    fresh[url] = path
+    return path
 
 def get_dates(start, end=None):
     """ Returns a list of monthly datetimes ranging from start to end (today by default). """
@@ -26,14 +407,21 @@ def get_dates(start, end=None):
         end = date.today().replace(day=1)
     return list(rrule(MONTHLY, dtstart=start, until=end))
 
+def report_dates(first, start=None, end=None):
+    """ Monthly datetimes of reports published since first, limited to the months from start to end. """
+    return get_dates(max(first, start) if start else first, end)
+
+def in_range(dt, start=None, end=None):
+    """ Whether a date, or each date of a Series, falls within the months from start to end, both included. """
+    dt = pd.to_datetime(dt)
+    after = dt >= pd.Timestamp(start) if start else True
+    before = dt < pd.Timestamp(end) + pd.DateOffset(months=1) if end else True
+    return after & before
+
+@timed('links')
 def get_links(url, href_keys=[], text_keys=[]):
     """ Returns all links on a page which contain keywords. """
-    response = requests.get(url)
-    # Forbidden request, try more valid user header.
-    if response.status_code == 403:
-        HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/99.0.4844.83 Safari/537.36'}
-        response = requests.get(url, headers=HEADERS)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = backend('bs4').BeautifulSoup(fetch(url), 'html.parser')
     links = []
     for link in soup.find_all('a'):
         href = link.get('href')
@@ -43,66 +431,385 @@ def get_links(url, href_keys=[], text_keys=[]):
             links.append(urljoin(url, href.replace(' ', '%20')))
     return links
 
+def fetch(url):
+    """ Download a url through the cache, raising an error for unsuccessful responses. """
+    return fetch_path(url).read_bytes()
+
+def fetch_all(urls, max_workers=16):
+    """ 
+    Download many urls at the same time.
+
+    Returns {url: content} for the successful downloads only, in the same order as urls.
+    Useful for guessed urls, where missing months are expected.
+    """
+    def attempt(url):
+        try:
+            return fetch(url)
+        except requests.RequestException:
+            return None
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        contents = list(pool.map(attempt, urls))
+    return {url: content for url, content in zip(urls, contents) if content is not None}
+
+def fetch_links(urls, max_workers=16):
+    """ 
+    Download links which should exist, at the same time.
+
+    Like fetch_all, but every failed download is printed and recorded as a failed document,
+    so an outage doesn't look like a run without new data.
+    """
+    def attempt(url):
+        try:
+            return fetch(url)
+        except requests.RequestException as e:
+            print(e.args)
+            print(f"*Unable to download {url}")
+            record_failure(url, e)
+            return None
+    urls = list(urls)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        contents = list(pool.map(attempt, urls))
+    return {url: content for url, content in zip(urls, contents) if content is not None}
+
 def extract_date(text, regex, datefmt):
     """ Extract a date from a text through regex and datefmt. """
     return datetime.strptime(re.search(regex, text)[0], datefmt)
 
-def save(data, filename, numeric_cols=None, folder='Finished States'):
+@timed('save')
+def save(data, filename, numeric_cols=None, folder='Finished States', start=None, end=None):
     """ 
-    Save a dataframe to a file.
+    Save dataframes to the Parquet store.
     
     Cleans up the numeric data by removing [($,)] and making negative where needed.
+    Only rows in the months from start to end are kept, when given.
     
-    Checks for existing file with filename to keep old data intact.
+    Rows are upserted into the store, so old data is kept intact. The first save imports an existing
+    Excel file with filename, if there is one. Excel files are exported from the store with Store.export_excel.
+    Rows are also added to the long fact table, Facts.
     """
+    data = [x for x in data if x is not None]
+    if not data:
+        print(f'No new data for {filename}')
+        return
     df = pd.concat(data)
+    if start or end:
+        df = df[in_range(df['Date'], start, end)]
+        if df.empty:
+            print(f'No data in range for {filename}')
+            return
     # Clean numeric data and remove blank rows.
     if numeric_cols:
         Table.to_numeric(df, numeric_cols)
         df = df.replace(0, pd.NA)
         df = df.dropna(how='all', subset=numeric_cols)
-    # Look up old data, if exists.
-    Path(folder).mkdir(exist_ok=True)
-    try:
-        print('Attempting to find old data')
-        matches = list(Path(folder).glob(filename))
-        assert len(matches) <= 1, f"There should be one match for {filename} in current or sub-directories\nMatches: {matches}"
-        print(f'Combining with "{matches[0]}"')
-        old_df = pd.read_excel(matches[0]).replace(0, pd.NA)
-        combined_df = pd.concat([old_df, df]).drop_duplicates()
-        print(f'New Data {df.shape} Old Data {old_df.shape}')
-        print(f'Combined {combined_df.shape}')
-    except (IndexError, FileNotFoundError):
-        print('No old data found')
-        combined_df = df.copy().replace(0, pd.NA)
-    # Sort if columns are present. Index is usually somewhat ordered from scraping.
-    combined_df = combined_df.reset_index(drop=True)
-    combined_df.index.name = 'Index'
-    if 'Sub-Category' in combined_df.columns:
-        sorting = ['Retail', 'Online', 'Online Poker', 'Online Casino', 'Total', 'Interactive Slots', 'Banking Tables', 'Non-Banking Tables (Poker)']
-        combined_df['Sub-Category'] = Table.categorize(combined_df['Sub-Category'], sorting)
-    if 'Sport Level' in combined_df.columns:
-        sorting = ['Professional', 'College', 'Motor Race', 'Other Event']
-        combined_df['Sport Level'] = Table.categorize(combined_df['Sport Level'], sorting)
-    sorting = [x for x in ['Date', 'Provider', 'Sport Level', 'Sub-Category'] if x in combined_df.columns]
-    sorting.append('Index')
-    combined_df = combined_df.sort_values(by=sorting, ascending=True)
-    combined_df.to_excel(Path(folder) / filename, index=False)
+    run_stats['rows'] += len(df)
+    store = Store(folder)
+    facts = Facts(folder)
+    legacy = Path(folder) / filename
+    if legacy.exists() and not store.exists(df['State'].iat[0], df['Category'].iat[0]):
+        print(f'Importing old data from "{legacy}"')
+        old = pd.read_excel(legacy).replace(0, pd.NA)
+        store.upsert(old, numeric_cols)
+        facts.upsert(old, numeric_cols or [])
+    print(f'Saving {df.shape} to store')
+    store.upsert(df, numeric_cols)
+    facts.upsert(df, numeric_cols or [])
+
+class Manifest:
+    """ 
+    Record of the source files already ingested for a state, stored as JSON keyed by url.
 
+    Each entry keeps the state, category, sub-category, month and content hash of a source.
+    Months older than final_after are assumed final and aren't downloaded again.
+    Sources with the same content hash aren't parsed again.
+
+    When scraping the months from start to end, only sources of a month in range are recorded,
+    since just part of the other sources was saved.
+
+    Each registered source keeps its own manifest, so sources of a state can run at once. 
+    A new one starts from the state's manifest, if there is one.
+    """
+    final_after = relativedelta(months=3)
+
+    def __init__(self, state, folder='Finished States', start=None, end=None, source=None):
+        self.state = state
+        self.start, self.end = start, end
+        self.path = Path(folder) / 'Manifests' / f'{source or state}.json'
+        path = self.path if self.path.exists() else Path(folder) / 'Manifests' / f'{state}.json'
+        self.entries = json.loads(path.read_text()) if path.exists() else {}
+        self.pending = {}
+
+    def is_final(self, url):
+        entry = self.entries.get(url)
+        return bool(entry and entry['month'] and datetime.fromisoformat(entry['month']) < datetime.today() - self.final_after)
+
+    def unfinished(self, urls):
+        """ Returns urls which are not final yet. """
+        return [url for url in urls if not self.is_final(url)]
+
+    def unfinished_months(self, candidates):
+        """ 
+        Returns the urls of {month: [url, ...]} whose month is not final yet.
+
+        A month guessed under several names is final once any of them is, so the names which don't exist aren't tried again.
+        """
+        final = {self.entries[url]['month'][:7] for url in self.entries if self.is_final(url)}
+        return [url for month, urls in candidates.items() if f'{month:%Y-%m}' not in final for url in urls]
+
+    def changed(self, contents):
+        """ Filters {url: content} down to new or changed content. """
+        return {url: content for url, content in contents.items()
+                if self.entries.get(url, {}).get('sha256') != hashlib.sha256(content).hexdigest()}
+
+    def add(self, url, content, category, sub_category=None, month=None):
+        """ Stage a scraped source. Only written by commit, once it has been saved. """
+        if (self.start or self.end) and not (month and in_range(month, self.start, self.end)):
+            return
+        self.pending[url] = {'state': self.state,
+                             'category': category,
+                             'sub_category': sub_category,
+                             'month': month.isoformat() if month else None,
+                             'url': url,
+                             'sha256': hashlib.sha256(content).hexdigest() if content is not None else None}
+
+    def commit(self):
+        self.entries.update(self.pending)
+        self.pending = {}
+        write_atomic(self.path, json.dumps(self.entries, indent=1).encode())
+
+class Store:
+    """ 
+    Parquet store with one file per state, category and year: Store/<State>/<Category>/<Year>.parquet
+
+    Rows are upserted a partition at a time. Rows with the same identifying (non-numeric) columns as new rows are
+    replaced by all of them, since a key can hold several rows (New York has a row per week, dated by month).
+    Sort orderings are saved as dictionary-encoded categories.
+    """
+    orderings = {
+        'Sub-Category': ['Retail', 'Online', 'Online Poker', 'Online Casino', 'Total', 'Interactive Slots', 'Banking Tables', 'Non-Banking Tables (Poker)'],
+        'Sport Level': ['Professional', 'College', 'Motor Race', 'Other Event']
+    }
+
+    def __init__(self, folder='Finished States'):
+        self.folder = Path(folder)
+        self.root = self.folder / 'Store'
+
+    def partitions(self, state, category):
+        return sorted((self.root / state / category).glob('*.parquet'))
+
+    def exists(self, state, category):
+        return len(self.partitions(state, category)) > 0
+
+    def prepare(self, df, numeric_cols):
+        """ Consistent dtypes, so partitions can be written and combined. """
+        df = df.copy()
+        df['Date'] = pd.to_datetime(df['Date'])
+        for col in df.columns:
+            if col in numeric_cols:
+                df[col] = df[col].astype('Float64')
+            elif col in self.orderings:
+                df[col] = Table.categorize(df[col], self.orderings[col])
+            elif col in ['State', 'Category']:
+                df[col] = df[col].astype('category')
+            elif df[col].dtype == object:
+                df[col] = df[col].astype('string')
+        return df
+
+    def sort(self, df):
+        """ Sort if columns are present. Order within matching rows is kept from scraping. """
+        sorting = [x for x in ['Date', 'Provider', 'Sport Level', 'Sub-Category'] if x in df.columns]
+        return df.sort_values(by=sorting, kind='stable').reset_index(drop=True)
+
+    def upsert(self, df, numeric_cols=None):
+        """ 
+        Add rows to the store, replacing every old row with the same identifying columns as a new row.
+
+        Without numeric columns, rows are only identified by all their values, so only exact duplicates are replaced.
+        """
+        numeric_cols = [x for x in numeric_cols or [] if x in df.columns]
+        keys = [x for x in df.columns if x not in numeric_cols] if numeric_cols else None
+        df = self.prepare(df, numeric_cols)
+        years = df['Date'].dt.year.rename('Year')
+        for (state, category, year), part in df.groupby(['State', 'Category', years], observed=True, dropna=False):
+            path = self.root / state / category / f"{'Unknown' if pd.isna(year) else int(year)}.parquet"
+            if path.exists():
+                old = self.prepare(pd.read_parquet(path), numeric_cols)
+                if keys:
+                    old = old[~self.key_index(old, keys).isin(self.key_index(part, keys))]
+                part = pd.concat([old, part])
+                print(f'Combining {part.shape} with "{path}"')
+            if not keys:
+                part = part.drop_duplicates(keep='last')
+            write_atomic(path, self.sort(part).to_parquet(index=False))
+
+    @staticmethod
+    def key_index(df, keys):
+        """ Identifying columns of each row as an index, comparing missing values and categories by value. """
+        return pd.MultiIndex.from_frame(df.reindex(columns=keys).astype('string').fillna(''))
+
+    def read(self, state, category):
+        """ All years of a state's category as one dataframe. """
+        return self.sort(pd.concat([pd.read_parquet(x) for x in self.partitions(state, category)]))
+
+    def export_excel(self):
+        """ Write every state and category in the store to Excel, e.g. 'Arizona (OSB).xlsx'. """
+        for state_dir in sorted(x for x in self.root.iterdir() if x.is_dir()):
+            for category_dir in sorted(x for x in state_dir.iterdir() if x.is_dir()):
+                short = re.search(r'\((\w+)\)', category_dir.name)
+                filename = f'{state_dir.name} ({short[1] if short else category_dir.name}).xlsx'
+                print(f'Exporting "{filename}"')
+                self.read(state_dir.name, category_dir.name).to_excel(self.folder / filename, index=False)
+
+    def load(self):
+        """ Every state and category in the store, with its numeric columns. """
+        for state_dir in sorted(x for x in self.root.iterdir() if x.is_dir()):
+            for category_dir in sorted(x for x in state_dir.iterdir() if x.is_dir()):
+                df = self.read(state_dir.name, category_dir.name)
+                yield df, [x for x in df.columns if pd.api.types.is_float_dtype(df[x])]
+
+class Facts:
+    """ 
+    Long fact table of every state in SQLite, at <folder>/facts.sqlite, indexed by (state, date) and (provider, date).
+
+    Each value of a state's numeric columns is a row of (state, category, sub_category, date, provider, sub_provider,
+    detail, metric, value). Metrics keep the state's column names (GGR, Handle, ...). Other identifying columns,
+    like Sport Level, are kept in detail as 'Sport Level=College'. Missing dimensions are stored as ''.
+    Values sharing every other key (New York's weekly rows, dated by month) are numbered by occurrence.
+    Rows scraped again replace all the old ones with the same key.
+    """
+    dimensions = {'State': 'state', 'Category': 'category', 'Sub-Category': 'sub_category', 'Date': 'date', 
+                  'Provider': 'provider', 'Sub-Provider': 'sub_provider'}
+    identity = [*dimensions.values(), 'detail', 'metric']
+    keys = [*identity, 'occurrence']
+    schema = f"""
+        CREATE TABLE IF NOT EXISTS facts ({', '.join(f'{x} TEXT NOT NULL' for x in identity)}, occurrence INTEGER NOT NULL,
+                                          value REAL NOT NULL, UNIQUE ({', '.join(keys)}));
+        CREATE INDEX IF NOT EXISTS facts_state_date ON facts (state, date);
+        CREATE INDEX IF NOT EXISTS facts_provider_date ON facts (provider, date);
+    """
+
+    def __init__(self, folder='Finished States'):
+        self.path = Path(folder) / 'facts.sqlite'
+
+    def exists(self):
+        """ Whether the fact table exists, with the current columns. """
+        if not self.path.exists():
+            return False
+        with closing(sqlite3.connect(self.path, timeout=60)) as connection:
+            columns = [x[1] for x in connection.execute('PRAGMA table_info(facts)')]
+        return columns == [*self.keys, 'value']
+
+    def connect(self):
+        """ 
+        Sources write from several processes, so writers wait for each other and readers don't block them.
+
+        A table from before occurrences were kept is dropped, to be loaded again from the store.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=60)
+        connection.execute('PRAGMA journal_mode=WAL')
+        columns = [x[1] for x in connection.execute('PRAGMA table_info(facts)')]
+        if columns and 'occurrence' not in columns:
+            connection.execute('DROP TABLE facts')
+        connection.executescript(self.schema)
+        return connection
+
+    @classmethod
+    def melt(cls, df, numeric_cols):
+        """ One row for every value of numeric_cols in a state's dataframe. """
+        numeric_cols = [x for x in numeric_cols if x in df.columns]
+        df = df.reset_index(drop=True)
+        long = pd.DataFrame({name: df[col].astype('string').fillna('') if col in df.columns else '' 
+                             for col, name in cls.dimensions.items()}, index=df.index)
+        long['date'] = pd.to_datetime(df['Date']).dt.strftime('%Y-%m-%d').fillna('')
+        long['detail'] = ''
+        for col in [x for x in df.columns if x not in cls.dimensions and x not in numeric_cols]:
+            part = (col + '=' + df[col].astype('string')).fillna('')
+            long['detail'] = long['detail'].where(long['detail'].eq('') | part.eq(''), long['detail'] + '; ') + part
+        values = df[numeric_cols].apply(pd.to_numeric, errors='coerce').astype(float)
+        long = long.join(values).melt(id_vars=[*cls.dimensions.values(), 'detail'], var_name='metric', value_name='value')
+        long = long.dropna(subset='value')
+        long['occurrence'] = long.groupby(cls.identity, sort=False).cumcount()
+        return long[[*cls.keys, 'value']]
+
+    def upsert(self, df, numeric_cols):
+        """ Add a state's rows, replacing all values with the same key. """
+        long = self.melt(df, numeric_cols)
+        where = ' AND '.join(f'{x} = ?' for x in self.identity)
+        with closing(self.connect()) as connection, connection:
+            connection.executemany(f'DELETE FROM facts WHERE {where}', 
+                                   long[self.identity].drop_duplicates().itertuples(index=False, name=None))
+            connection.executemany(f"INSERT INTO facts VALUES ({', '.join('?' * len(long.columns))})", 
+                                   long.itertuples(index=False, name=None))
+        print(f'Saving {len(long)} facts to "{self.path}"')
+
+    def load(self, store):
+        """ Fill the fact table from everything already in the store. """
+        for df, numeric_cols in store.load():
+            self.upsert(df, numeric_cols)
+
+    def query(self, sql, params=()):
+        """ Run SQL against the facts table, as a dataframe with parsed dates. """
+        with closing(self.connect()) as connection:
+            df = pd.read_sql_query(sql, connection, params=params)
+        if 'date' in df.columns:
+            df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def select(self, state=None, category=None, provider=None, metric=None, start=None, end=None):
+        """ 
+        Facts matching every filter given, in the months from start to end.
+
+        state, category, provider and metric each take a value or a list of values, e.g.
+        Facts().select(metric=['GGR', 'Gross Revenue'], start=date(2023, 1, 1)).
+        """
+        clauses, params = [], []
+        for col, value in {'state': state, 'category': category, 'provider': provider, 'metric': metric}.items():
+            if value is not None:
+                values = [value] if isinstance(value, str) else list(value)
+                clauses.append(f"{col} IN ({', '.join('?' * len(values))})")
+                params += values
+        if start:
+            clauses.append('date >= ?')
+            params.append(f'{start:%Y-%m-01}')
+        if end:
+            clauses.append('date < ?')
+            params.append(f'{end + relativedelta(day=1, months=1):%Y-%m-%d}')
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return self.query(f'SELECT * FROM facts {where} ORDER BY state, date, provider', params)
 
 class Table:
+    # State classes declare their sources: the pages, files or url templates reports are published at,
+    # the outputs written from them, how often they're published, and the resource reading them is bound by: 
+    # 'http' downloads (CSV, Excel), 'pdf' parsing (CPU) or a 'browser'.
+    sources = []
+    outputs = []
+    cadence = 'monthly'
+    resource = 'http'
+
     @staticmethod
     def categorize(col, categories):
         """ Returns a category column, which is helpful for sorting. """
         return col.astype('category').cat.set_categories(categories)
     
+    # Removes [$,)] and makes '(' negative.
+    numeric_table = str.maketrans({'$': None, ',': None, ')': None, '(': '-'})
+
     @staticmethod
+    @timed('to_numeric')
     def to_numeric(df, cols):
-        """ Tries to make certain columns in a dataframe numeric. Removes certain charcters. """
-        # Remove weird characters.
-        df[cols] = df[cols].replace(r'[$,)]', '', regex=True).replace(r'[(]', '-', regex=True)
-        df[cols] = df[cols].apply(pd.to_numeric, errors='coerce', axis=1)
-        df[cols] = df[cols].round(2)
+        """ 
+        Tries to make certain columns in a dataframe numeric, one column at a time. Removes certain charcters.
+
+        Handles $, commas, accounting parentheses, trailing '-' placeholders and blank strings.
+        """
+        for col in cols:
+            values = df[col]
+            if pd.api.types.infer_dtype(values, skipna=True) in ['string', 'mixed', 'mixed-integer']:
+                # Non-strings come back as NaN, so are kept as they were.
+                text = values.str.translate(Table.numeric_table).str.rstrip('-')
+                values = text.where(text.notna(), values)
+            df[col] = pd.to_numeric(values, errors='coerce').round(2)
 
     @staticmethod
     def slice_by_cond(df, cond):
@@ -140,6 +847,79 @@ class Table:
         """ Repeat rows of a dataframe where a condition is met. """
         return pd.concat([df, df.loc[cond]]).sort_index().reset_index(drop=True)
 
+class Pdf:
+    """ 
+    A downloaded PDF shared by PyPDF2, pypdfium2 and camelot.
+
+    Downloaded once into the cache and memory-mapped from there, so nothing is downloaded twice or written to temp files.
+    """
+    def __init__(self, url):
+        self.url = url
+        self.path = fetch_path(url)
+        with open(self.path, 'rb') as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._reader = None
+        self._document = None
+
+    @property
+    def reader(self):
+        """ PyPDF2 reader over the mapped bytes. """
+        if self._reader is None:
+            self._reader = backend('PyPDF2').PdfReader(self.buffer)
+        return self._reader
+
+    @property
+    def document(self):
+        """ pypdfium2 document. pdfium maps the cached file itself. """
+        if self._document is None:
+            self._document = backend('pypdfium2').PdfDocument(self.path)
+        return self._document
+
+    @property
+    def pages(self):
+        return len(self.document)
+
+    def text(self, idx):
+        """ PyPDF2 text of a page. """
+        return self.reader.pages[idx].extract_text()
+
+    def tables(self, pages='1', **kwargs):
+        """ camelot tables, read from the cached file. """
+        if kwargs.get('flavor', 'lattice') == 'lattice':
+            kwargs.setdefault('backend', PageImages())
+        return backend('camelot').read_pdf(str(self.path), pages=pages, **kwargs)
+
+    def close(self):
+        if self._document is not None:
+            self._document.close()
+        self._reader = None
+        self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class PageImages:
+    """ 
+    Page images for camelot's lattice tables: ghostscript's when it is installed, otherwise rendered by pypdfium2.
+
+    pypdfium2 already reads the text, so tables can be read where the ghostscript library can't be installed.
+    """
+    resolution = 300
+
+    def convert(self, pdf_path, png_path):
+        if find_library('gs') is not None:
+            ghostscript = backend('camelot.backends.ghostscript_backend').GhostscriptBackend()
+            return ghostscript.convert(pdf_path, png_path, self.resolution)
+        # camelot converts one page pdfs.
+        document = backend('pypdfium2').PdfDocument(pdf_path)
+        try:
+            document[0].render(scale=self.resolution / 72).to_pil().save(png_path)
+        finally:
+            document.close()
+
 class OSBTable(Table):
     category = 'Online Sports Betting (OSB)'
 
@@ -151,98 +931,89 @@ class Arizona(OSBTable):
     state = 'Arizona'
     numeric_cols = ['Gross Wagering Receipts', 'Amount Won', 'Adjusted Gross Wagering Receipts', 'Promotional Credits']
     url = "https://gaming.az.gov/resources/reports#event-wagering-report-archive"
+    # Reports are linked from url, but named by hand, so future months are guessed in two formats.
+    sources = [url,
+               "https://gaming.az.gov/sites/default/files/EW%20Revenue%20Report%20for%20Website%20-%20{month:%b}%20{month:%Y}.pdf",
+               "https://gaming.az.gov/sites/default/files/EW%20Website%20Revenue%20Report-{month:%b}%20{month:%Y}.pdf"]
+    outputs = ['Arizona (OSB).xlsx']
+    resource = 'pdf'
 
     def __init__(self, url):
         self.url = url
         self.date = self.find_timestamp(self.url)
 
+    # Each line of a report is a provider followed by these, as Retail then Online.
+    width = 8
+    # Values of a line: a number (with $ and thousands separators, negative in parentheses or with '-'),
+    # a '-' placeholder or a lone '$', which is skipped. Groups are (sign, number, placeholder).
+    value_pattern = re.compile(r'(?<!\S)(?:\$+|\$*(?:([(-])?(\d[\d,]*\.?\d*|\.\d+)\)?|(-+))\$*)(?!\S)')
+
+    def read_lines(self):
+        """ Text lines of the first page. Skip first line. """
+        with Pdf(self.url) as pdf:
+            return pdf.text(0).split('\n')[1:]
+
     def clean(self):
-        path = Path('arizona_temp.pdf')
-        path.unlink(missing_ok=True)
-        path.write_bytes(requests.get(self.url).content)
-        pdf = PdfReader(str(path))
-        
-        data = []
-        # Skip first line.
-        for line in pdf.pages[0].extract_text().split('\n')[1:]:
-            provider = self.get_provider(line)
-            if provider == '':
-                break
-            values = self.get_numerical(line)
-            data.append({
-                'State': self.state,
-                'Category': self.category,
-                'Sub-Category': 'Retail',
-                'Date': self.date,
-                'Provider': provider,
-                'Gross Wagering Receipts': values[0],
-                'Amount Won': values[2],
-                'Adjusted Gross Wagering Receipts': values[4],
-                'Promotional Credits': values[6]
-            })
-            data.append({
-                'State': self.state,
-                'Category': self.category,
-                'Sub-Category': 'Online',
-                'Date': self.date,
-                'Provider': provider,
-                'Gross Wagering Receipts': values[1],
-                'Amount Won': values[3],
-                'Adjusted Gross Wagering Receipts': values[5],
-                'Promotional Credits': values[7]
-            })
-        path.unlink()
-        return pd.DataFrame(data)
+        return self.parse_reports([self.read_lines()], [self.date])
+
+    @staticmethod
+    def parse_reports(reports, dates):
+        """ 
+        Parse the lines of many reports, each with a date, into one dataframe.
+
+        Lines are read until the first one without a provider.
+        """
+        providers, values, line_dates = [], [], []
+        for lines, dt in zip(reports, dates):
+            for line in lines:
+                provider, numbers = Arizona.tokenize(line)
+                if provider == '':
+                    break
+                providers.append(provider)
+                values.append(numbers)
+                line_dates.append(dt)
+        # (line, field, Retail/Online) -> a Retail and an Online row per line.
+        values = np.array(values, dtype=float).reshape(-1, Arizona.width // 2, 2)
+        out_df = pd.DataFrame(values.transpose(0, 2, 1).reshape(-1, Arizona.width // 2), columns=Arizona.numeric_cols)
+        out_df.insert(0, 'State', Arizona.state)
+        out_df.insert(1, 'Category', Arizona.category)
+        out_df.insert(2, 'Sub-Category', np.tile(['Retail', 'Online'], len(providers)))
+        out_df.insert(3, 'Date', pd.to_datetime(np.repeat(line_dates, 2)))
+        out_df.insert(4, 'Provider', np.repeat(providers, 2))
+        return out_df
     
+    @staticmethod
+    def tokenize(line):
+        """ 
+        Split a line into the provider and a fixed width list of values, in one regex scan.
+
+        Provider is everything before the first '-', '$', or numeric value. 
+        '-' placeholders are 0 and missing values are NaN.
+        """
+        first = Arizona.value_pattern.search(line)
+        if first is None:
+            return ' '.join(line.split()), [np.nan] * Arizona.width
+        values = [(-float(num.replace(',', '')) if sign else float(num.replace(',', ''))) if num else 0.0
+                  for sign, num, dash in Arizona.value_pattern.findall(line, first.start()) if num or dash]
+        values = values[:Arizona.width]
+        return ' '.join(line[:first.start()].split()), values + [np.nan] * (Arizona.width - len(values))
+
     @staticmethod
     def find_timestamp(url):
         url = url.replace('%20', ' ')
         match = re.search(r'\w+ \d{4}', url)[0]
         match = f'{match[:3]} {match[-4:]}'
         return datetime.strptime(match, '%b %Y')
-    
-    @staticmethod
-    def get_provider(line):
-        values = line.split()
-        # Find provider by everything before first '-', '$', or numeric value.
-        provider = []
-        for val in values:
-            if val == '-' or val == '$':
-                break
-            else:
-                val = val.replace(',', '')
-                try:
-                    float(val)
-                    break
-                except ValueError:
-                    provider.append(val)
-        return ' '.join(provider)
-
-    @staticmethod
-    def get_numerical(line):
-        values = line.split()
-        # Find values by '-', or numeric values.
-        numerical = []
-        for val in values:
-            # Remove trailing '$'.
-            val = val.strip('$')
-            if '-' in val:
-                numerical.append(0)
-            else:
-                val = val.replace(',', '')
-                try:
-                    numerical.append(float(val))
-                except ValueError:
-                    continue
-        return numerical
 
 class ConnecticutGaming(IGamingTable):
     state = 'Connecticut'
     url = "https://data.ct.gov/api/views/imqd-at3c/rows.csv?accessType=DOWNLOAD&bom=true&format=true"
     numeric_cols = ['Wagers', 'Amount Won', 'Gross Gaming Revenue', 'Promotional Credits', 'Adjusted Revenue']
+    sources = [url]
+    outputs = ['Connecticut (iGaming).xlsx']
 
     def __init__(self, url):
-        self.df = pd.read_csv(url)
+        self.df = pd.read_csv(fetch_path(url))
 
     def clean(self):
         out_df = pd.DataFrame({
@@ -264,10 +1035,13 @@ class ConnecticutSports(OSBTable):
     retail_url = "https://data.ct.gov/api/views/yb54-t38r/rows.csv?accessType=DOWNLOAD&bom=true&format=true"
     online_url = "https://data.ct.gov/api/views/xf6g-659c/rows.csv?accessType=DOWNLOAD&bom=true&format=true"
     numeric_cols = ['Wagers', 'Amount Won', 'Online Sports Wagering', 'Gross Gaming Revenue', 'Promotional Credits', 'Adjusted Revenue']
+    sources = [retail_url, online_url]
+    sub_categories = {retail_url: 'Retail', online_url: 'Online'}
+    outputs = ['Connecticut (OSB).xlsx']
 
     def __init__(self, url, sub_category):
         self.url = url
-        self.df = pd.read_csv(self.url)
+        self.df = pd.read_csv(fetch_path(self.url))
         self.sub_category = sub_category
 
     def clean(self):
@@ -291,28 +1065,117 @@ class Illinois(OSBTable):
     state = 'Illinois'
     url = "https://www.igb.illinois.gov/SportsReports.aspx"
     numeric_cols = ['Tier 1 Wagers', 'Tier 1 Handle', 'Tier 2 Wagers', 'Tier 2 Handle']
-
-    def __init__(self, dt, driver):
+    sources = [url]
+    outputs = ['Illinois (OSB).xlsx']
+    # Reports come from a form, which falls back to a browser.
+    resource = 'browser'
+    file = 'AllActivityDetail.csv'
+    # Columns which may hold each row's month, when a report covers several months.
+    month_cols = ['Month', 'Period', 'Report Month', 'Activity Month', 'Date']
+
+    def __init__(self, dt, df):
         self.date = dt
-        # Downloads 'AllActivityDetail.csv' to this directory.
-        file = 'AllActivityDetail.csv'
-        self.download_report(driver)
-        self.df = pd.read_csv(file, skiprows=3)
-        # Removes 'AllActivityDetail.csv'.
-        Path(file).unlink()
-
-    def download_report(self, driver):
-        """ Download a report through selenium driver by a specific date. Only month and year are important. """
-        month, year = self.date.strftime('%B %Y').split()
+        self.df = df
+
+    @staticmethod
+    def request_report(start, end):
+        """ 
+        Get a report over plain HTTP by replaying the ASP.NET form. Only month and year are important.
+
+        Fills in the same fields as the browser would: the four date selects, the 'ViewCSV' option and the one button.
+        """
+        page = http_get(Illinois.url)
+        page.raise_for_status()
+        form = backend('bs4').BeautifulSoup(page.text, 'html.parser').find('form')
+        fields = {}
+        for x in form.find_all('input'):
+            if x.get('name') and x.get('type', 'text') in ['hidden', 'text']:
+                fields[x['name']] = x.get('value', '')
+        for select in form.find_all('select'):
+            option = select.find('option', selected=True) or select.find('option')
+            if select.get('name') and option:
+                fields[select['name']] = option.get('value', option.text)
+        # Start month, start year, end month, end year.
+        selects = [x.find('select') for x in form.find_all(class_='interactiveDateData')]
+        for select, text in zip(selects, [f'{start:%B}', str(start.year), f'{end:%B}', str(end.year)], strict=True):
+            option = select.find('option', string=lambda x: x and x.strip() == text)
+            fields[select['name']] = option.get('value', text)
+        view = form.find('input', attrs={'value': 'ViewCSV'})
+        fields[view['name']] = 'ViewCSV'
+        # Only one button. Either a named submit or a __doPostBack link.
+        button = form.find(class_='button')
+        postback = re.search(r"__doPostBack\('([^']*)','([^']*)'\)", str(button))
+        if postback:
+            fields['__EVENTTARGET'], fields['__EVENTARGUMENT'] = postback.groups()
+        elif button.get('name'):
+            fields[button['name']] = button.get('value', '')
+        response = http_request('POST', urljoin(Illinois.url, form.get('action', '')), data=fields)
+        response.raise_for_status()
+        if 'html' in response.headers.get('Content-Type', ''):
+            raise ValueError('Report form did not return a csv')
+        return response.content
+
+    @staticmethod
+    def download_report(start, end, driver, folder):
+        """ Download a report through selenium driver into folder. Waits for the file instead of a fixed time. """
+        By = backend('selenium.webdriver.common.by').By
+        path = Path(folder) / Illinois.file
+        path.unlink(missing_ok=True)
         start_m, start_y, end_m, end_y = driver.find_elements(By.CLASS_NAME, 'interactiveDateData')
-        start_m.find_element(By.TAG_NAME, 'select').send_keys(month)
-        start_y.find_element(By.TAG_NAME, 'select').send_keys(year)
-        end_m.find_element(By.TAG_NAME, 'select').send_keys(month)
-        end_y.find_element(By.TAG_NAME, 'select').send_keys(year)
+        start_m.find_element(By.TAG_NAME, 'select').send_keys(f'{start:%B}')
+        start_y.find_element(By.TAG_NAME, 'select').send_keys(str(start.year))
+        end_m.find_element(By.TAG_NAME, 'select').send_keys(f'{end:%B}')
+        end_y.find_element(By.TAG_NAME, 'select').send_keys(str(end.year))
         driver.find_element(By.CSS_SELECTOR, 'input[value="ViewCSV"]').click()
         # Only one button.
         driver.find_element(By.CLASS_NAME, 'button').click()
-        sleep(3)
+        # Chrome writes to a .crdownload file and renames it when finished.
+        backend('selenium.webdriver.support.ui').WebDriverWait(driver, 60, poll_frequency=0.1).until(lambda _: path.exists())
+        content = path.read_bytes()
+        path.unlink()
+        return content
+
+    @staticmethod
+    def read_report(content):
+        return pd.read_csv(BytesIO(content), skiprows=3)
+
+    @staticmethod
+    def split_months(df):
+        """ Split a multi-month report into {month: df}. Returns None if rows have no month. """
+        for col in Illinois.month_cols:
+            if col in df.columns:
+                months = pd.to_datetime(df[col], format='mixed', errors='coerce').dt.to_period('M').dt.to_timestamp()
+                if months.notna().all():
+                    return {dt.to_pydatetime(): x.reset_index(drop=True) for dt, x in df.groupby(months)}
+        return None
+
+    @staticmethod
+    def get_reports(dates, driver=None, folder=None):
+        """ 
+        Returns ({month: df}, {month: error}) for dates, over HTTP or through driver.
+
+        Asks for the whole range in one report, falling back to a report per month when rows can't be split by month.
+        Failed months are returned rather than recorded, so the caller can try them again through the browser.
+        """
+        def get_report(start, end):
+            if driver is None:
+                return Illinois.read_report(Illinois.request_report(start, end))
+            return Illinois.read_report(Illinois.download_report(start, end, driver, folder))
+        if len(dates) > 1:
+            months = Illinois.split_months(get_report(min(dates), max(dates)))
+            if months is not None:
+                return {dt: months[dt] for dt in dates if dt in months}, {}
+            print('Report has no month column, getting months one at a time')
+        reports, failures = {}, {}
+        for dt in dates:
+            try:
+                print(f"Scraping {dt}")
+                reports[dt] = get_report(dt, dt)
+            except BaseException as e:
+                print(e.args)
+                print("*Unable to scrape")
+                failures[dt] = e
+        return reports, failures
 
     def clean(self):
         out_df = pd.DataFrame({
@@ -327,33 +1190,44 @@ class Illinois(OSBTable):
         return out_df
 
     @staticmethod
-    def selenium():
-        """ Opens up selenium driver at Illinois url. Downloads to this directory. """
+    def selenium(folder):
+        """ Opens up selenium driver at Illinois url. Downloads to folder. """
+        webdriver = backend('selenium.webdriver')
+        By = backend('selenium.webdriver.common.by').By
+        expected_conditions = backend('selenium.webdriver.support.expected_conditions')
         options = webdriver.ChromeOptions()
         options.add_argument('--headless')
-        prefs = {'download.default_directory' : str(Path().absolute())}
+        prefs = {'download.default_directory' : str(Path(folder).absolute())}
         options.add_experimental_option('prefs', prefs)
         driver = webdriver.Chrome(options=options)
         
         driver.get(Illinois.url)
-        sleep(2)
+        backend('selenium.webdriver.support.ui').WebDriverWait(driver, 30).until(expected_conditions.presence_of_element_located((By.CLASS_NAME, 'interactiveDateData')))
         return driver
 
 class Indiana(Table):
     state = 'Indiana'
     xlsx_date = date(2019, 7, 1)
+    # One workbook a month holds both categories.
+    sources = ['https://www.in.gov/igc/files/{month:%Y-%m}-Revenue.xlsx']
+    outputs = ['Indiana (iGaming).xlsx', 'Indiana (OSB).xlsx']
 
-    def __init__(self, dt):
+    def __init__(self, dt, content=None):
         self.date = dt
-        timestamp = self.date.strftime("%Y-%m")
-        self.url = f'https://www.in.gov/igc/files/{timestamp}-Revenue.xlsx'
+        self.url = self.get_url(dt)
+        # Both sheets come from one download.
+        self.excel = pd.ExcelFile(BytesIO(content or fetch(self.url)))
         self.gaming_df = self.original_gaming()
         self.sports_df = self.original_sports_betting()
 
+    @staticmethod
+    def get_url(dt):
+        return Indiana.sources[0].format(month=dt)
+
     def original_gaming(self):
         """ HTML/PDF before July 2019. """
         # First sheet is casinos.
-        df = pd.read_excel(self.url, sheet_name=0, skiprows=3)
+        df = pd.read_excel(self.excel, sheet_name=0, skiprows=3)
         return df.dropna(how='all', subset=df.columns[1:], ignore_index=True).dropna(how='all', axis=1)
 
     def clean_gaming(self):
@@ -384,48 +1258,57 @@ class Indiana(Table):
             return None
         else:
             # Last sheet is sports betting.
-            return pd.read_excel(self.url, sheet_name=-1, skiprows=3)
+            return pd.read_excel(self.excel, sheet_name=-1, skiprows=3)
 
     def clean_sports_betting(self):
         if self.sports_df is None:
             return None
         split_dfs = self.split_by_cols(self.sports_df, [slice(0, 4), slice(5, 9), slice(10, 14)])
-        parsed_dfs = [self.parse_sports_wagers(x) for x in split_dfs]
-        out_df = pd.concat(parsed_dfs).reset_index(drop=True)
-        return out_df
+        # All three slices are parsed together, keyed by part.
+        df = (pd.concat([x.set_axis(['Sub-Provider', 'Handle', 'AGR'], axis=1) for x in split_dfs], keys=range(len(split_dfs))).
+              reset_index(level=0, names='Part').
+              reset_index(drop=True))
+        return self.parse_sports_wagers(df)
     
     def parse_sports_wagers(self, df):
-        out_df = []
-        provider = None
-        should_add_row = False
-        total_handle = 0
-        for sub, handle, gross in df.itertuples(index=False):
-            if handle == "Handle":
-                provider = sub
-                should_add_row = True
-                continue
-            if should_add_row:
-                # Adjustments handle is empty string.
-                if sub == "Adjustments":
-                    pass
-                elif sub != "Taxable AGR":
-                    total_handle += handle
-                else:
-                    sub = "Total"
-                    should_add_row = False
-                    handle = total_handle
-                    total_handle = 0
-                out_df.append({'State': self.state, 'Category': 'Online Sports Betting (OSB)', 'Date': self.date, 
-                               'Provider': provider, 'Sub-Provider': sub, 'Handle': handle, 'AGR': gross})
-        return pd.DataFrame(out_df)
+        """
+        Each provider is a "Handle" header row, followed by its sub-providers until "Taxable AGR".
+        
+        "Taxable AGR" becomes the Total, with handle summed over the sub-providers (except Adjustments).
+        """
+        is_header = df['Handle'] == 'Handle'
+        is_total = df['Sub-Provider'] == 'Taxable AGR'
+        provider = df['Sub-Provider'].where(is_header).groupby(df['Part']).ffill()
+        # Rows up to and including a total are one segment.
+        segment = is_total.groupby(df['Part']).cumsum() - is_total
+        # Rows after a total are skipped until the next header.
+        block = is_header.groupby(df['Part']).cumsum()
+        after_total = (is_total.groupby([df['Part'], block]).cumsum() - is_total) > 0
+        keep = provider.notna() & ~is_header & ~after_total
+        summed = pd.to_numeric(df['Handle'].where(keep & ~is_total & (df['Sub-Provider'] != 'Adjustments'), 0))
+        total_handle = summed.groupby([df['Part'], segment]).cumsum()
+        out_df = pd.DataFrame({
+            'State': self.state, 
+            'Category': 'Online Sports Betting (OSB)', 
+            'Date': self.date, 
+            'Provider': provider, 
+            'Sub-Provider': df['Sub-Provider'].mask(is_total, 'Total'), 
+            'Handle': df['Handle'].mask(is_total, total_handle), 
+            'AGR': df['AGR']
+        })
+        return out_df[keep].reset_index(drop=True)
 
 class Iowa(OSBTable):
     state = 'Iowa'
     numeric_cols = ['Sports Wagering Net Receipts', 'Sports Wagering Handle', 'Sports Wagering Payouts', 'Retail Net Receipts', 'Retail Handle', 
                     'Retail Payouts', 'Internet Net Receipts', 'Internet Handle', 'Internet Payouts', 'State Tax']
+    url = 'https://irgc.iowa.gov/publications-reports/sports-wagering-revenue'
+    sources = [f'{url}/archived-sports-revenue', url]
+    outputs = ['Iowa (OSB).xlsx']
+    resource = 'pdf'
 
-    def __init__(self, table, dt, sub_category, keyword):
-        self.df = table.df
+    def __init__(self, df, dt, sub_category, keyword):
+        self.df = df
         self.df.iloc[:,0] = self.df.iloc[:,0].str.replace('\\', 'I')
         self.date = extract_date(dt, r'\w+ \d{4}', '%B %Y')
         self.sub_category = sub_category
@@ -462,23 +1345,22 @@ class Iowa(OSBTable):
     @staticmethod
     def fix_whitespace(df, col):
         """ Double space belongs to the next row. Removes \n. """
-        mistake = None
-        for idx, entry in enumerate(df[col]):
-            if pd.isna(entry):
-                entry, next_entry = df.at[idx+1, col].split('  ')
-                df.at[idx+1, col] = next_entry
-            if mistake:
-                entry = f'{mistake} {entry}'
-                mistake = None
-            # Double space is a mistake.
-            if '  ' in entry:
-                entry, mistake = entry.split('  ')
-            df.at[idx, col] = entry.replace('\n', ' ').replace('  ', ' ')
+        entries = df[col]
+        # An empty entry is the start of the next entry, before its double space.
+        is_empty = entries.isna()
+        next_parts = entries.shift(-1).str.split('  ', n=1, expand=True).reindex(columns=[0, 1]).astype(object)
+        entries = entries.mask(is_empty, next_parts[0])
+        entries = entries.mask(is_empty.shift(1, fill_value=False), next_parts[1].shift(1))
+        # Otherwise, what follows a double space is the start of the next entry.
+        parts = entries.str.split('  ', n=1, expand=True).reindex(columns=[0, 1]).astype(object)
+        mistakes = parts[1].shift(1)
+        entries = parts[0].where(mistakes.isna(), mistakes + ' ' + parts[0])
+        df[col] = entries.str.replace('\n', ' ').str.replace('  ', ' ')
     
     @staticmethod
+    @timed('links')
     def get_links(url, keyword):
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = backend('bs4').BeautifulSoup(fetch(url), 'html.parser')
         links = []
         for link in soup.find_all('a'):
             href = link.get('href')
@@ -489,26 +1371,35 @@ class Iowa(OSBTable):
         return links
 
     @staticmethod
-    def parse_pdf(url):
-        """ Open a pdf, read titles, parse tables, and close pdf. """
-        path = Path('iowa_temp.pdf')
-        path.unlink(missing_ok=True)
-        path.write_bytes(requests.get(url).content)
+    def parse_pdf(url, pool=None):
+        """ 
+        Open a pdf, read titles, parse tables, and close pdf.
 
-        pdf = PdfReader(str(path))
+        Pages are classified by title in one text pass, so FY and unknown pages never reach camelot.
+        Tables of the remaining pages are read across pool, when given.
+        """
+        pages = {}
+        with Pdf(url) as pdf:
+            for idx, page in enumerate(pdf.reader.pages):
+                try:
+                    pages[idx] = Iowa.classify_page(page)
+                except:
+                    print(f'Unable to parse page {idx + 1} from {url}')
+            path = pdf.path
+        mapper = pool.map if pool else map
+        tables = mapper(Iowa.read_table, [path] * len(pages), pages)
         parsed = []
-        for idx, page in enumerate(pdf.pages):
-            try:
-                parsed.append(Iowa.parse_page(str(path), page, idx))
-            except:
+        for (idx, args), df in zip(pages.items(), tables):
+            if df is None:
                 print(f'Unable to parse page {idx + 1} from {url}')
-        path.unlink()
+            else:
+                parsed.append(Iowa(df, *args))
         return parsed
 
     @staticmethod
-    def parse_page(path, page, idx):
+    def classify_page(page):
         """ 
-        Parse a single page of the pdf. 
+        Classify a single page of the pdf by title. Returns Iowa's arguments besides the table.
 
         Title is first non-empty line.
         Title contains Category and Date.
@@ -519,14 +1410,21 @@ class Iowa(OSBTable):
         # Skip full year for now.
         if "FY" in date:
             raise Exception(f"FY not currently being parsed")
-        table = camelot.read_pdf(path, pages=str(idx + 1))[0]
         # Check that category matches up.
         if "ONLINE SPORTS WAGERING" in category:
-            return Iowa(table, date, 'Online', "INTERNET PAYOUTS")
+            return date, 'Online', "INTERNET PAYOUTS"
         elif "SPORTS WAGERING REVENUE" in category:
-            return Iowa(table, date, 'Retail', "STATE TAX")
+            return date, 'Retail', "STATE TAX"
         else:
             raise Exception(f"{category} - {date} not found")
+
+    @staticmethod
+    def read_table(path, idx):
+        """ First table of a page, or None. Runs in worker processes, so only the dataframe is returned. """
+        try:
+            return backend('camelot').read_pdf(str(path), pages=str(idx + 1), backend=PageImages())[0].df
+        except Exception:
+            return None
         
     @staticmethod
     def get_title(page):
@@ -540,12 +1438,16 @@ class Iowa(OSBTable):
 class Kansas(OSBTable):
     state = 'Kansas'
     numeric_cols = ['Settled Wagers', 'Revenues', 'State Share']
+    sources = ['https://kslottery.com/publications/sports-monthly-revenues/']
+    outputs = ['Kansas (OSB).xlsx']
+    resource = 'pdf'
     
     def __init__(self, link):
         self.link = link
         self.date = extract_date(link, r'\d{4}-\d{2}', '%Y-%m')
         # Assuming Page 1 is always current month.
-        self.df = camelot.read_pdf(self.link, pages='1')[0].df
+        with Pdf(self.link) as pdf:
+            self.df = pdf.tables(pages='1')[0].df
         self.df = self.df.replace('', pd.NA).dropna(how='all')
 
     def clean(self):
@@ -578,18 +1480,18 @@ class Maryland(OSBTable):
     state = 'Maryland'
     numeric_cols = ['Handle', 'Amount Won', 'Promotion Play', 'Other Deductions', 'Adjusted Gross Revenue']
     ordered = ['State', 'Category', 'Sub-Category', 'Date', 'Provider', 'Handle', 'Amount Won', 'Promotion Play', 'Other Deductions', 'Adjusted Gross Revenue']
+    # Uploaded the month after, some months with a shortened name.
+    sources = ['https://www.mdgaming.com/wp-content/uploads/{upload:%Y/%m}/{month:%B-%Y}-Sports-Wagering-Data.xlsx',
+               'https://www.mdgaming.com/wp-content/uploads/{upload:%Y/%m}/{month:%B-%Y}-SW-Data.xlsx']
+    outputs = ['Maryland (OSB).xlsx']
 
-    def __init__(self, link):
-        try:
-            self.df = pd.read_excel(link)
-        except HTTPError:
-            link = link.replace('Sports-Wagering', 'SW')
-            self.df = pd.read_excel(link)
+    def __init__(self, link, content=None):
         self.link = link
+        self.content = content or fetch(link)
         self.date = extract_date(self.link, r'\w+-\d{4}', '%B-%Y')
 
     def clean(self):
-        df = pd.read_excel(self.link, skiprows=3)
+        df = pd.read_excel(BytesIO(self.content), skiprows=3)
         df = df.dropna(thresh=5, axis=1).dropna(subset='Licensee', how='any').dropna(thresh=5)
         df.reset_index(drop=True, inplace=True)
         slices = self.slice_by_cond(df, df['Licensee'] == 'Combined')
@@ -623,34 +1525,60 @@ class Maryland(OSBTable):
 
 class Michigan:
     state = 'Michigan'
+    sources = ['https://www.michigan.gov/mgcb/detroit-casinos/resources/revenues-and-wagering-tax-information']
 
     def __init__(self, df):
         self.df = df.replace(r'[\*\n]', '', regex=True)
         self.year = re.search(r'\d{4}', self.df.columns[1])[0]
 
-    def clean(self, jump):
-        data = []
-        # TODO - Totals row should be similar logic.
-        for month, *casinos in self.body[:-1].itertuples(index=False):
-            idx = 0
-            date = datetime.strptime(f'{self.year}-{month}', '%Y-%B')
-            while idx < len(casinos) - 2:
-                data.append({
-                    'State': self.state,
-                    'Category': self.category,
-                    'Sub-Category': self.subcategory,
-                    'Date': date,
-                    **self.header.iloc[idx // jump],
-                    **self.get_next(casinos, idx)
-                })
-                idx += jump
-        out_df = pd.DataFrame(data)
+    def clean(self):
+        """ 
+        Reshape the month by casino block into one row per (month, casino).
+
+        Each casino spans len(fields) columns, selected by position since sheets repeat the field headers.
+        Rows which are not a month (Totals) are reshaped the same way, as rows for the year: dated January 1st, 
+        with 'Year Total' in Sub-Provider.
+        """
+        jump = len(self.fields)
+        casinos = self.body.shape[1] - 1
+        blocks = len(range(0, casinos - 2, jump))
+        labels = self.body.iloc[:, 0].astype(str)
+        dates = pd.to_datetime(self.year + '-' + labels, format='%Y-%B', errors='coerce')
+        is_month = dates.notna().to_numpy()
+        is_total = labels.str.contains('Total', case=False).to_numpy() & ~is_month
+        values = self.body.iloc[:, 1:1 + blocks * jump].to_numpy().reshape(len(self.body), blocks, jump)
+        header = self.header.iloc[:blocks].reset_index(drop=True)
+        out_df = self.reshape(header, values[is_month], dates[is_month])
+        if not is_total.any():
+            return out_df
+        totals = header.copy()
+        if 'Sub-Provider' in totals:
+            totals['Sub-Provider'] = (totals['Sub-Provider'].fillna('').astype(str) + ' Year Total').str.strip()
+        else:
+            totals['Sub-Provider'] = 'Year Total'
+        totals_df = self.reshape(totals, values[is_total], [pd.Timestamp(f'{self.year}-01-01')] * is_total.sum())
+        return pd.concat([out_df, totals_df], ignore_index=True)
+
+    def reshape(self, header, values, dates):
+        """ (month, casino, field) values to a long dataframe. """
+        months, blocks, jump = values.shape
+        out_df = pd.DataFrame(values.reshape(-1, jump), columns=self.fields)
+        out_df = pd.concat([header.iloc[np.tile(np.arange(blocks), months)].reset_index(drop=True), out_df], axis=1)
+        out_df.insert(0, 'State', self.state)
+        out_df.insert(1, 'Category', self.category)
+        out_df.insert(2, 'Sub-Category', self.subcategory)
+        out_df.insert(3, 'Date', np.repeat(pd.DatetimeIndex(dates), blocks))
         return out_df
     
 class MichiganRetailSports(Michigan, OSBTable):
+    fields = ['Total Handle', 'Total Gross Receipts', 'Adjusted Gross Receipts', 'State Tax']
+    outputs = ['Michigan (OSB).xlsx']
+    resource = 'pdf'
+
     def __init__(self, link):
         # PDFs are easier to parse than encrypted Excel.
-        self.df = self.first_row_to_columns(camelot.read_pdf(link)[0].df).replace('', pd.NA)
+        with Pdf(link) as pdf:
+            self.df = self.first_row_to_columns(pdf.tables()[0].df).replace('', pd.NA)
         self.category = 'Online Sports Betting (OSB)'
         self.subcategory = 'Retail'
         
@@ -662,20 +1590,12 @@ class MichiganRetailSports(Michigan, OSBTable):
         # Edge case where extra dates are included.
         self.body['Month'] = self.body['Month'].apply(lambda x: x.split(' ')[0])
 
-    def clean(self):
-        return super().clean(4)
-
-    def get_next(self, data, idx):
-        return {
-            'Total Handle': data[idx],
-            'Total Gross Receipts': data[idx+1],
-            'Adjusted Gross Receipts': data[idx+2],
-            'State Tax': data[idx+3]
-        }
-
 class MichiganOnlineSports(Michigan, OSBTable):
+    fields = ['Total Handle', 'Total Gross Receipts', 'Adjusted Gross Receipts', 'State Tax']
+    outputs = ['Michigan (OSB).xlsx']
+
     def __init__(self, link):
-        self.df = pd.read_excel(link, sheet_name=0)
+        self.df = pd.read_excel(fetch_path(link), sheet_name=0)
         self.category = 'Online Sports Betting (OSB)'
         self.subcategory = 'Online'
         
@@ -693,20 +1613,12 @@ class MichiganOnlineSports(Michigan, OSBTable):
             dropna(thresh=4)
         ))
         
-    def clean(self):
-        return super().clean(4)
-
-    def get_next(self, data, idx):
-        return {
-            'Total Handle': data[idx],
-            'Total Gross Receipts': data[idx+1],
-            'Adjusted Gross Receipts': data[idx+2],
-            'State Tax': data[idx+3]
-        }
-
 class MichiganGaming(Michigan, IGamingTable):
+    fields = ['Total Gross Receipts', 'Adjusted Gross Receipts', 'State Tax']
+    outputs = ['Michigan (iGaming).xlsx']
+
     def __init__(self, link, sheet):
-        self.df = pd.read_excel(link, sheet_name=sheet)
+        self.df = pd.read_excel(fetch_path(link), sheet_name=sheet)
         self.category = 'iGaming'
         self.subcategory = None
 
@@ -725,137 +1637,248 @@ class MichiganGaming(Michigan, IGamingTable):
         ))
 
     def clean(self):
-        return super().clean(3).replace(0, pd.NA).dropna(how='all', axis=1)
-
-    def get_next(self, data, idx):
-        return {
-            'Total Gross Receipts': data[idx],
-            'Adjusted Gross Receipts': data[idx+1],
-            'State Tax': data[idx+2]
-        }
+        return super().clean().replace(0, pd.NA).dropna(how='all', axis=1)
 
 class NewJersey:
     state = 'New Jersey'
-        
-    def __init__(self, link):
+    base_url = "https://www.nj.gov/oag/ge/docs/Financials"
+    resource = 'pdf'
+
+    def __init__(self, link, pool=None):
         self.link = link
         self.date = extract_date(self.link, '\w+\d{4}', '%B%Y')
-        self.temp_storage = 'new_jersey_temp.pdf'
+        self.pdf = None
+        self.pool = pool
 
     def read_pdf(self):
-        """ Saves a content stream to temp_storage. """
-        Path(self.temp_storage).unlink(missing_ok=True)
-        Path(self.temp_storage).write_bytes(requests.get(self.link).content)
+        """ Opens the pdf once for every reader. """
+        self.pdf = Pdf(self.link)
 
     def close_pdf(self):
-        """ Closes temp_storage. """
-        Path(self.temp_storage).unlink()
+        if self.pdf is not None:
+            self.pdf.close()
 
     def get_pages(self):
-        """ Gets the number of pages from temp storage. """
-        return len(PdfReader(self.temp_storage).pages)
+        """ Gets the number of pages. """
+        return self.pdf.pages
+
+    # Cell regions of each report layout, learned from camelot tables.
+    regions_path = Path('.cache') / 'regions.json'
+    # Text of a value cell: a number, maybe negative in parentheses, or a '-' placeholder.
+    value_pattern = re.compile(r'[$\s]*(?:\(?-?[\d,]*\.?\d+\)?|-+)[$\s]*')
 
     def get_casinos(self):
-        """ Open pdfium on page, getting casino header text only. """
-        pdf = pdfium.PdfDocument(self.temp_storage)
-        casinos = []
-        for page in pdf:
-            textpage = page.get_textpage()
-            casino = ''
-            # Using a flexible bound has proven the most successful. 2022 formatting in particular is unreliable.
-            bound = 1100
-            while casino == '':
-                bound -= 50
-                text = textpage.get_text_bounded(bottom=bound).removeprefix('INTERNET WIN - CURRENT MONTH')
-                casino = text.split('MONTHLY')[0].replace('\r\n', '').title()
-            casinos.append(casino)
-        return casinos
+        """ Casino header of every page, across pool when given. """
+        mapper = self.pool.map if self.pool else map
+        return list(mapper(self.read_casino, [self.pdf.path] * self.pdf.pages, range(self.pdf.pages)))
+
+    @staticmethod
+    def read_casino(path, idx):
+        """ 
+        Casino header of a page, which is the text above "MONTHLY". Runs in worker processes.
+
+        The header is located from character positions, so the page text is only extracted once.
+        """
+        document = backend('pypdfium2').PdfDocument(path)
+        try:
+            textpage = document[idx].get_textpage()
+            found = textpage.search('MONTHLY', match_case=True).get_next()
+            if found is not None:
+                bottom = textpage.get_charbox(found[0])[1]
+            else:
+                # Otherwise, the header is the top line of text.
+                rects = [textpage.get_rect(i) for i in range(textpage.count_rects())]
+                bottom = max(rects, key=lambda rect: rect[3])[1]
+            text = textpage.get_text_bounded(bottom=bottom).removeprefix('INTERNET WIN - CURRENT MONTH')
+            # Header lines are joined by a space.
+            return ' '.join(text.split('MONTHLY')[0].split()).title()
+        finally:
+            document.close()
     
     def get_tables(self):
         """ Open pdf through camelot, getting all tables. """
-        return camelot.read_pdf(self.link, pages='all', line_scale=25)  #Maybe 50
+        return self.pdf.tables(pages='all', line_scale=25)  #Maybe 50
 
-class NewJerseyGaming(NewJersey, IGamingTable):
     def clean(self):
-        """ Open PDF, read titles, and relevant first table values. """
+        """ Open PDF, read titles, and the values of cells on each page. """
         try:
             self.read_pdf()
-            num_pages = self.get_pages()
-            # Gather data from each page.
-            out = []
-            ## Avoid parsing title if possible.
-            #full_list = ["Bally's Atlantic City", 'Borgata Hotel Casino & Spa', 
-            #             'Caesars Interactive Entertainment', 'Golden Nugget', 'Hard Rock Atlantic City', 
-            #             'Ocean Casino Resort', 'Resorts Digital Gaming, LLC', 'Tropicana Casino & Resort']
-            #extra_list = full_list.copy()
-            #extra_list.insert(4, 'Golden Nugget')
-            #casinos = {7: full_list[1:].copy(), 8: full_list.copy(), 9: extra_list}[num_pages]
             casinos = self.get_casinos()
-            tables = self.get_tables()
-            assert len(tables) == num_pages * 2, "Parser didn't get correct number of tables."
-            for i, casino in zip(range(num_pages), casinos):
-                table = tables[i*2].df.replace(r'[$ \n]', '', regex=True)
-                row = table.iloc[1:,-1].str.rstrip('-')
-                out.append({'State': self.state,
-                            'Category': self.category,
-                            'Sub-Category': ['Online Poker', 'Online Casino', 'Total'],
-                            'Date': self.date,
-                            'Provider': casino,
-                            'Internet Gaming Win': [row[1], row[2], row[3]]})
-            return pd.DataFrame(out).explode(['Sub-Category', 'Internet Gaming Win'])
+            pages = self.get_values()
+            out_df = pd.DataFrame({
+                'State': self.state,
+                'Category': self.category,
+                'Sub-Category': np.tile(list(self.cells), len(casinos)),
+                'Date': self.date,
+                'Provider': np.repeat(casinos, len(self.cells)),
+                self.value_col: [value for page in pages for value in page.values()]
+            })
+            return out_df
         finally:
             self.close_pdf()
 
-class NewJerseySports(NewJersey, OSBTable):
-    def clean(self):
-        """ Open PDF, read titles, and get relevant values from first and third tables. """
+    def get_values(self):
+        """ 
+        Values of self.cells on every page, as a list of {sub-category: value}.
+
+        Cells are read from text positions, in the regions cached for the layout of this year. Each value is anchored
+        by the label of its row, so a shifted row doesn't silently give a neighbouring value.
+        Unknown layouts, or ones which no longer match, are read with camelot, which updates the cache.
+        """
+        key = f'{type(self).__name__} {self.date.year}'
+        regions = self.load_regions().get(key)
+        # Regions cached before anchors were kept are plain boxes.
+        if regions is not None and all(isinstance(x, dict) for x in regions.values()):
+            mapper = self.pool.map if self.pool else map
+            pages = list(mapper(self.read_cells, [self.pdf.path] * self.pdf.pages, range(self.pdf.pages), [regions] * self.pdf.pages))
+            if None not in pages:
+                return pages
+            print(f'Cached regions of {key} do not match, reading tables.')
+        pages, regions = self.parse_tables(self.get_tables())
+        # Only cache regions which read the page they were learned from.
+        if regions is not None and self.read_cells(self.pdf.path, 0, regions) == pages[0]:
+            self.save_regions(key, regions)
+        else:
+            print(f'Cells of {key} could not be anchored, not caching regions.')
+        return pages
+
+    def parse_tables(self, tables):
+        """ 
+        Values of self.cells on every page, from camelot tables, and the regions of the first page's cells.
+
+        Regions are {sub-category: {'value': box, 'label': box, 'text': label}}, the label being the first text left
+        of the value in its row. Regions are None when a cell has no label.
+        """
+        tables_per_page = len(tables) // self.pdf.pages
+        pages = []
+        for idx in range(self.pdf.pages):
+            page = {}
+            for sub_category, (table_num, row, col) in self.cells.items():
+                page[sub_category] = self.clean_cell(tables[idx * tables_per_page + table_num].df.iat[row, col])
+            pages.append(page)
+        regions = {}
+        for sub_category, (table_num, row, col) in self.cells.items():
+            table = tables[table_num]
+            col = col % table.df.shape[1]
+            labels = [x for x in range(col) if self.anchor_text(table.df.iat[row, x])]
+            if not labels:
+                return pages, None
+            cell, label = table.cells[row][col], table.cells[row][labels[0]]
+            regions[sub_category] = {'value': [cell.x1, cell.y1, cell.x2, cell.y2], 
+                                     'label': [label.x1, label.y1, label.x2, label.y2],
+                                     'text': self.anchor_text(table.df.iat[row, labels[0]])}
+        return pages, regions
+
+    @staticmethod
+    def read_cells(path, idx, regions):
+        """ 
+        {sub-category: value} of a page, read from the text within regions. Runs in worker processes.
+
+        None if any label is not the one learned, or any value is not a value.
+        """
+        document = backend('pypdfium2').PdfDocument(path)
         try:
-            self.read_pdf()
-            num_pages = self.get_pages()
-            # Gather data from each page.
-            out = []
-            casinos = self.get_casinos()
-            tables = self.get_tables()
-            tables_per_page = len(tables) // len(casinos)
-            for i, casino in zip(range(num_pages), casinos):
-                table_idx = tables_per_page * i
-                monthly_retail = self.get_value_from_table(tables, table_idx, (3, -1))
-                monthly_internet = self.get_value_from_table(tables, table_idx+2, (3, -1))
-                out.append({'State': self.state,
-                            'Category': self.category,
-                            'Sub-Category': ['Retail', 'Online'],
-                            'Date': self.date,
-                            'Provider': casino,
-                            'Gross Revenue': [monthly_retail, monthly_internet]})
-            out_df = pd.DataFrame(out).explode(['Sub-Category', 'Gross Revenue'])
-            out_df['Gross Revenue'] = out_df['Gross Revenue'].str.rstrip('-')
-            return out_df
+            textpage = document[idx].get_textpage()
+            page = {}
+            for sub_category, region in regions.items():
+                if NewJersey.anchor_text(textpage.get_text_bounded(*region['label'])) != region['text']:
+                    return None
+                text = textpage.get_text_bounded(*region['value'])
+                if not NewJersey.value_pattern.fullmatch(text):
+                    return None
+                page[sub_category] = NewJersey.clean_cell(text)
+            return page
         finally:
-            self.close_pdf()
+            document.close()
+
+    @staticmethod
+    def anchor_text(text):
+        """ Label text compared without whitespace or case, since camelot and pdfium wrap lines differently. """
+        return re.sub(r'\s+', '', str(text)).casefold()
+
+    @staticmethod
+    def clean_cell(text):
+        """ Removes $ and whitespace. A '-' placeholder is empty. """
+        return re.sub(r'[$\s]', '', text).rstrip('-')
+
+    @staticmethod
+    def load_regions():
+        if NewJersey.regions_path.exists():
+            return json.loads(NewJersey.regions_path.read_text())
+        return {}
+
+    @staticmethod
+    def save_regions(key, regions):
+        write_atomic(NewJersey.regions_path, json.dumps({**NewJersey.load_regions(), key: regions}, indent=2).encode())
 
-    def get_value_from_table(self, tables, table_num, coords):
-        """ Open camelot table, extract value from coordinates. """
-        df = tables[table_num].df
-        return df.iat[coords].lstrip('$').strip()
+class NewJerseyGaming(NewJersey, IGamingTable):
+    sources = [f'{NewJersey.base_url}/IGRTaxReturns/{{month:%Y}}/{{month:%B%Y}}.pdf']
+    outputs = ['New Jersey (iGaming).xlsx']
+    value_col = 'Internet Gaming Win'
+    # Sub-category: (table on page, row, column). Values are in the first table.
+    cells = {'Online Poker': (0, 1, -1), 'Online Casino': (0, 2, -1), 'Total': (0, 3, -1)}
+
+    def get_tables(self):
+        tables = super().get_tables()
+        assert len(tables) == self.get_pages() * 2, "Parser didn't get correct number of tables."
+        return tables
+
+class NewJerseySports(NewJersey, OSBTable):
+    sources = [f'{NewJersey.base_url}/SWRTaxReturns/{{month:%Y}}/{{month:%B%Y}}.pdf']
+    outputs = ['New Jersey (OSB).xlsx']
+    value_col = 'Gross Revenue'
+    # Sub-category: (table on page, row, column). Monthly values are in the first and third tables.
+    cells = {'Retail': (0, 3, -1), 'Online': (2, 3, -1)}
     
 class NewYork(OSBTable):
     state = 'New York'
+    sources = ['https://www.gaming.ny.gov/gaming/index.php?ID=4']
+    outputs = ['New York (OSB).xlsx']
+    cadence = 'weekly'
+    # Header rows are found within the first rows of a sheet.
+    scan_rows = 20
 
-    def __init__(self, link):
+    def __init__(self, link, df=None):
         self.link = link
         self.provider = unquote(self.link.split('/')[-1].split('.')[0].split('%20')[-1])
+        self.df = self.read_workbook(fetch_path(link)) if df is None else df
+
+    @staticmethod
+    def read_workbook(path):
+        """ 
+        Month and GGR columns of every sheet, streamed with openpyxl read only mode.
+
+        Runs in worker processes, so only the dataframe is returned.
+        """
+        workbook = backend('openpyxl').load_workbook(path, read_only=True, data_only=True)
+        try:
+            data = []
+            for sheet in workbook.worksheets:
+                header = NewYork.find_header(sheet)
+                if header is None:
+                    continue
+                row, date_col, ggr_col = header
+                first, last = min(date_col, ggr_col), max(date_col, ggr_col)
+                values = sheet.iter_rows(min_row=row + 1, min_col=first + 1, max_col=last + 1, values_only=True)
+                data.append(pd.DataFrame([(x[date_col - first], x[ggr_col - first]) for x in values], columns=['Date', 'GGR']))
+        finally:
+            workbook.close()
+        return pd.concat(data, ignore_index=True)
+
+    @staticmethod
+    def find_header(sheet):
+        """ (row, Month column, GGR column) of the first row with both, or None. Row is 1-based, columns 0-based. """
+        for row, cells in enumerate(sheet.iter_rows(max_row=NewYork.scan_rows, values_only=True), 1):
+            labels = [str(x) for x in cells]
+            date_cols = [idx for idx, x in enumerate(labels) if 'Month' in x]
+            ggr_cols = [idx for idx, x in enumerate(labels) if 'GGR' in x]
+            if date_cols and ggr_cols:
+                return row, date_cols[0], ggr_cols[0]
+        return None
 
     def clean(self):
-        data = []
-        excel_file = pd.ExcelFile(self.link)
-        sheets = excel_file.sheet_names
-        for sheet in sheets:
-            sheet_df = pd.read_excel(excel_file, sheet_name=sheet)
-            sheet_df = sheet_df.loc[:, sheet_df.applymap(lambda x: 'Month' in str(x) or 'GGR' in str(x)).any()]
-            sheet_df['Provider'] = self.provider
-            data.append(sheet_df)
-        df = pd.concat(data, ignore_index=True)
-        df = df.rename(columns={'Unnamed: 0': 'Date', 'Unnamed: 3': 'GGR'})
+        df = self.df.copy()
+        df['Provider'] = self.provider
         # convert the date_col column to datetime format
         df['Date'] = pd.to_datetime(df['Date'], format='mixed', errors='coerce')
         # keep only rows with datetime values in the date_col column
@@ -871,10 +1894,18 @@ class NewYork(OSBTable):
 
 class Pennsylvania:
     state = 'Pennsylvania'
+    base_url = "https://gamingcontrolboard.pa.gov/files/revenue"
 
     def __init__(self, link):
         self.link = link
-        self.df = pd.read_excel(link, skiprows=3)
+        self.df = pd.read_excel(fetch_path(link), skiprows=3)
+
+    @classmethod
+    def links(cls, start=None, end=None):
+        """ Workbooks of the fiscal years covering the months from start to end, since FY2019. Fiscal years start in July. """
+        last = end or date.today()
+        years = range(max(2019, start.year - 1) if start else 2019, last.year + (last.month >= 7))
+        return [cls.sources[0].format(year=i, next_year=i + 1) for i in years]
 
     def get_providers(self, key):
         """ Get values above keys as providers. """
@@ -882,19 +1913,38 @@ class Pennsylvania:
         return self.df.iloc[indexes,0].to_list()
 
     def clean(self):
-        """ Clean an Excel sheet. clean_row should change for type of table. """
-        out_df = []
-        for month, row in self.body.iterrows():
-            month = datetime.strptime(month, '%B %Y')
-            i_row = iter(row)
-            idx = 0
-            while idx < len(self.providers):
-                out_df.append(self.clean_row(idx, i_row, month))
-                idx += 1
-        return pd.DataFrame(out_df)
+        """ 
+        Clean an Excel sheet. Each provider is a block of columns, mapped to values by layout.
+
+        layout is {sub-category: {numeric column: position in block}}. Missing values are NA.
+        """
+        width = 1 + max(pos for fields in self.layout.values() for pos in fields.values())
+        months = pd.to_datetime(self.body.index, format='%B %Y')
+        body = self.body.to_numpy()[:, :width * len(self.providers)].reshape(len(months), len(self.providers), width)
+        # (month, provider, sub-category, numeric column)
+        values = np.full((*body.shape[:2], len(self.layout), len(self.numeric_cols)), pd.NA, dtype=object)
+        for sub, (sub_category, fields) in enumerate(self.layout.items()):
+            for col, pos in fields.items():
+                values[:, :, sub, self.numeric_cols.index(col)] = body[:, :, pos]
+        out_df = pd.DataFrame(values.reshape(-1, len(self.numeric_cols)), columns=self.numeric_cols)
+        out_df.insert(0, 'State', self.state)
+        out_df.insert(1, 'Category', self.category)
+        out_df.insert(2, 'Sub-Category', np.tile(list(self.layout), len(months) * len(self.providers)))
+        out_df.insert(3, 'Date', np.repeat(months, len(self.providers) * len(self.layout)))
+        out_df.insert(4, 'Provider', np.tile(np.repeat(self.providers, len(self.layout)), len(months)))
+        return out_df
 
 class PennsylvaniaGaming(Pennsylvania, IGamingTable):
     numeric_cols = ['Wagers Received', 'Amount Won', 'Gross Revenue']
+    # One workbook per fiscal year, from July of year to June of the next.
+    sources = [f'{Pennsylvania.base_url}/Gaming_Revenue_Monthly_Interactive_Gaming_FY{{year}}{{next_year}}.xlsx']
+    outputs = ['Pennsylvania (iGaming).xlsx']
+    # Per provider: slots wagers, won, revenue, banking wagers, revenue, non-banking revenue.
+    layout = {
+        'Interactive Slots': {'Wagers Received': 0, 'Amount Won': 1, 'Gross Revenue': 2},
+        'Banking Tables': {'Wagers Received': 3, 'Gross Revenue': 4},
+        'Non-Banking Tables (Poker)': {'Gross Revenue': 5},
+    }
 
     def __init__(self, link):
         super().__init__(link)
@@ -903,25 +1953,17 @@ class PennsylvaniaGaming(Pennsylvania, IGamingTable):
         self.body = self.df.loc[self.df.isin(self.parse_columns).any(axis=1)]
         self.body = self.body.dropna(how='all', axis=1).T.iloc[1:-1]
 
-    def clean(self):
-        return super().clean().explode(['Sub-Category', 'Wagers Received', 'Amount Won', 'Gross Revenue'])
-
-    def clean_row(self, idx, i_row, month):
-        # 1 - wagers, 2 - amount won, 3 - revenue
-        islots_1, islots_2, islots_3 = next(i_row), next(i_row), next(i_row)
-        ibanking_1, ibanking_3 = next(i_row), next(i_row)
-        nbanking_3 = next(i_row)
-        return {'State': self.state,
-                'Category': self.category,
-                'Sub-Category': ['Interactive Slots', 'Banking Tables', 'Non-Banking Tables (Poker)'],
-                'Date': month,
-                'Provider': self.providers[idx],
-                'Wagers Received': [islots_1, ibanking_1, pd.NA],
-                'Amount Won': [islots_2, pd.NA, pd.NA],
-                'Gross Revenue': [islots_3, ibanking_3, nbanking_3]}
-
 class PennsylvaniaSports(Pennsylvania, OSBTable):
     numeric_cols = ['Handle', 'Revenue', 'Promotional Credits', 'Gross Revenue']
+    sources = [f'{Pennsylvania.base_url}/Gaming_Revenue_Monthly_Sports_Wagering_FY{{year}}{{next_year}}.xlsx']
+    outputs = ['Pennsylvania (OSB).xlsx']
+    # Per provider: total handle, revenue, promotional, gross revenue, retail handle, revenue, 
+    # online handle, revenue, promotional, gross revenue.
+    layout = {
+        'Total': {'Handle': 0, 'Revenue': 1, 'Promotional Credits': 2, 'Gross Revenue': 3},
+        'Retail': {'Handle': 4, 'Revenue': 5, 'Gross Revenue': 5},
+        'Online': {'Handle': 6, 'Revenue': 7, 'Promotional Credits': 8, 'Gross Revenue': 9},
+    }
 
     def __init__(self, link):
         super().__init__(link)
@@ -931,96 +1973,87 @@ class PennsylvaniaSports(Pennsylvania, OSBTable):
         self.body = self.df.loc[self.df.isin(self.parse_columns).any(axis=1)]
         self.body = self.body.dropna(how='all', axis=1).T.iloc[1:-3]
 
-    def clean(self):
-        return super().clean().explode(['Sub-Category', 'Handle', 'Revenue', 'Promotional Credits', 'Gross Revenue'])
-
-    def clean_row(self, idx, i_row, month):
-        # 1 - handle, 2 - revenue, 3 - promotional, 4 - gross revenue
-        total_1, total_2, total_3, total_4 = next(i_row), next(i_row), next(i_row), next(i_row)
-        retail_1, retail_4 = next(i_row), next(i_row)
-        online_1, online_2, online_3, online_4 = next(i_row), next(i_row), next(i_row), next(i_row)
-        return {'State': self.state,
-                'Category': self.category,
-                'Sub-Category': ['Total', 'Retail', 'Online'],
-                'Date': month,
-                'Provider': self.providers[idx],
-                'Handle': [total_1, retail_1, online_1],
-                'Revenue': [total_2, retail_4, online_2],
-                'Promotional Credits': [total_3, pd.NA, online_3],
-                'Gross Revenue': [total_4, retail_4, online_4]}
-
 class WestVirgina:
     state = 'West Virginia'
+    # Zip archives of weekly workbooks, linked from one page.
+    sources = ['https://wvlottery.com/requests/2020-06-15-1110/?report=new']
+    cadence = 'weekly'
 
-    def __init__(self, zipfile):
+    def __init__(self, zipfile, pool=None):
         self.zip = zipfile
         self.filenames = [file.filename for file in self.zip.filelist]
+        self.pool = pool
+
+    def read_members(self):
+        """ 
+        Every member of the zip, with all of its sheets stacked and keyed by Provider.
+
+        Each workbook is parsed once, across pool when given.
+        """
+        mapper = self.pool.map if self.pool else map
+        contents = [self.zip.read(file) for file in self.filenames]
+        return pd.concat(mapper(self.read_member, contents, [self.sheetnames] * len(contents)), ignore_index=True)
 
 class WestVirginiaGaming(WestVirgina, IGamingTable):
     numeric_cols = ['Wagers', 'Amount Won', 'Revenue']
+    link_text = 'iGaming'
+    outputs = ['West Virginia (iGaming).xlsx']
+    sheetnames = ['Mountaineer', 'Charles Town', 'Greenbrier']
 
-    def __init__(self, zipfile):
-        super().__init__(zipfile)
-        self.sheetnames = ['Mountaineer', 'Charles Town', 'Greenbrier']
+    @staticmethod
+    def read_member(content, sheetnames):
+        """ Weekly rows of every sheet in one workbook. Runs in worker processes. """
+        sheets = pd.read_excel(BytesIO(content), sheet_name=sheetnames, skiprows=2)
+        for sheet, df in sheets.items():
+            # Clean columns.
+            df.columns = df.columns.str.rstrip('* ')
+            sheets[sheet] = df.rename(columns={'Week Ending': 'Date', 'Paids': 'Amount Won'})
+        df = pd.concat(sheets, names=['Provider'])
+        # Get relevant dates.
+        df = df.replace(r'[\* ]', '', regex=True)
+        df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y', errors='coerce')
+        return df.reset_index(level=0)[['Date', 'Provider', 'Wagers', 'Amount Won', 'Revenue']].dropna(subset='Date')
     
     def clean(self):
-        dataframes = []
-        for file in self.filenames:
-            for sheet in self.sheetnames:
-                df = pd.read_excel(self.zip.open(file), sheet_name=sheet, skiprows=2)
-                # Clean columns.
-                df.columns = df.columns.str.rstrip('* ')
-                df = df.rename(columns={'Week Ending': 'Date', 'Paids': 'Amount Won'})
-                # Get relevant dates.
-                df = df.replace(r'[\* ]', '', regex=True)
-                df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y', errors='coerce').dropna()
-                grouped_df = df.groupby(pd.Grouper(key='Date', freq='MS')).sum()
-                grouped_df.reset_index(inplace=True)
-                grouped_df.insert(0, 'State', self.state)
-                grouped_df.insert(1, 'Category', self.category)
-                grouped_df.insert(3, 'Provider', sheet)
-                dataframes.append(grouped_df)
-        return pd.concat(dataframes)[['State', 'Category', 'Date', 'Provider', 'Wagers', 'Amount Won', 'Revenue']]
+        df = self.read_members()
+        grouped_df = df.groupby([pd.Grouper(key='Date', freq='MS'), 'Provider'], sort=True).sum()
+        grouped_df.reset_index(inplace=True)
+        grouped_df.insert(0, 'State', self.state)
+        grouped_df.insert(1, 'Category', self.category)
+        return grouped_df[['State', 'Category', 'Date', 'Provider', 'Wagers', 'Amount Won', 'Revenue']]
 
 class WestVirginiaSports(WestVirgina, OSBTable):
     numeric_cols = ['Gross Tickets Written', 'Voids', 'Tickets Cashed', 'Total Taxable Receipts']
+    link_text = 'Sports Wagering'
+    outputs = ['West Virginia (OSB).xlsx']
+    sheetnames = ['Mountaineer', 'Wheeling', 'Mardi Gras', 'Charles Town', 'Greenbrier']
 
-    def __init__(self, zipfile):
-        super().__init__(zipfile)
-        self.sheetnames = ['Mountaineer', 'Wheeling', 'Mardi Gras', 'Charles Town', 'Greenbrier']
+    @staticmethod
+    def read_member(content, sheetnames):
+        """ Weekly rows of every sheet in one workbook, by sub-category. Runs in worker processes. """
+        sheets = pd.read_excel(BytesIO(content), sheet_name=sheetnames, skiprows=3)
+        cols = ['Date', 'Gross Tickets Written', 'Voids', 'Tickets Cashed', 'Total Taxable Receipts']
+        for sheet, df in sheets.items():
+            df = df.rename(columns={df.columns[0]: 'Date'})
+            # Get relevant dates.
+            df = df.replace(r'[\* ]', '', regex=True)
+            df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y', errors='coerce')
+            df = df.dropna(how='all', axis=1).dropna()
+            # Parse sub-categories, which are in positional column groups.
+            sheets[sheet] = pd.concat({
+                'Retail': df.iloc[:, :5].set_axis(cols, axis=1),
+                'Online': df.iloc[:, [0, 5, 6, 7, 8]].set_axis(cols, axis=1),
+                'Total': df.iloc[:, [0, 9, 10, 11, 12]].set_axis(cols, axis=1),
+            }, names=['Sub-Category'])
+        return pd.concat(sheets, names=['Provider']).reset_index(level=[0, 1])
 
     def clean(self):
-        dataframes = []
-        for file in self.filenames:
-            for sheet in self.sheetnames:
-                df = pd.read_excel(self.zip.open(file), sheet_name=sheet, skiprows=3)
-                df = df.rename(columns={df.columns[0]: 'Date'})
-                # Get relevant dates.
-                df = df.replace(r'[\* ]', '', regex=True)
-                df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y', errors='coerce').dropna()
-                df = df.dropna(how='all', axis=1).dropna()
-                
-                # Parse sub-categories.
-                retail = df.iloc[:,:5]
-                retail.columns = ['Date', 'Gross Tickets Written', 'Voids', 'Tickets Cashed', 'Total Taxable Receipts']
-                retail.insert(0, 'Sub-Category', 'Retail')
-                online = df.iloc[:,[0,5,6,7,8]]
-                online.columns = ['Date', 'Gross Tickets Written', 'Voids', 'Tickets Cashed', 'Total Taxable Receipts']
-                online.insert(0, 'Sub-Category', 'Online')
-                total = df.iloc[:,[0,9,10,11,12]]
-                total.columns = ['Date', 'Gross Tickets Written', 'Voids', 'Tickets Cashed', 'Total Taxable Receipts']
-                total.insert(0, 'Sub-Category', 'Total')
-                combined_df = pd.concat([retail, online, total], ignore_index=True)
-
-                # Set Date as index for Grouper.
-                combined_df = combined_df.set_index('Date')
-                grouped_df = combined_df.groupby([pd.Grouper(freq='MS'), 'Sub-Category']).sum()
-                grouped_df.reset_index(inplace=True)
-                grouped_df.insert(0, 'State', self.state)
-                grouped_df.insert(1, 'Category', self.category)
-                grouped_df.insert(4, 'Provider', sheet)
-                dataframes.append(grouped_df)
-        return pd.concat(dataframes)[['State', 'Category', 'Sub-Category', 'Date', 'Provider', 'Gross Tickets Written', 'Voids', 'Tickets Cashed', 'Total Taxable Receipts']]
+        df = self.read_members()
+        grouped_df = df.groupby([pd.Grouper(key='Date', freq='MS'), 'Provider', 'Sub-Category'], sort=True).sum()
+        grouped_df.reset_index(inplace=True)
+        grouped_df.insert(0, 'State', self.state)
+        grouped_df.insert(1, 'Category', self.category)
+        return grouped_df[['State', 'Category', 'Sub-Category', 'Date', 'Provider', 'Gross Tickets Written', 'Voids', 'Tickets Cashed', 'Total Taxable Receipts']]
 
 ### Scraping functions ###
 def print_start(state):
@@ -1029,17 +2062,53 @@ def print_start(state):
 def print_end(state):
     print(f"Ending {state}".center(50, '+'))
     
-def scrape(data, cls, *args):
+def scrape(data, cls, *args, **kwargs):
+    """ Append cls(*args, **kwargs).clean() to data. Returns whether it succeeded. """
+    document = args[0]
     try:
         print(f"Scraping {args}")
-        data.append(cls(*args).clean())
+        with stage('parse', document, profile=cls):
+            table = cls(*args, **kwargs)
+        with stage('clean', document, profile=cls):
+            df = table.clean()
+        record_rows(document, df)
+        data.append(df)
+        return True
     except BaseException as e:
         print(e.args)
         print("*Unable to scrape")
-    finally:
-        Path('temp.pdf').unlink(missing_ok=True)
+        record_failure(document, e)
+        return False
     
-def scrape_arizona():
+### Sources ###
+# Every source scraped, by name: the classes declaring it and the function refreshing it.
+SOURCES = {}
+# Resources from least to most demanding. A source needing several is scheduled by the most demanding.
+RESOURCES = ['http', 'pdf', 'browser']
+
+def source(*classes, default=True):
+    """ 
+    Register a function refreshing the sources of classes, named after the function without scrape_.
+
+    Sources which aren't default only run when selected.
+    """
+    def decorator(func):
+        SOURCES[func.__name__.removeprefix('scrape_')] = {'classes': classes, 'run': func, 'default': default}
+        return func
+    return decorator
+
+def describe(name):
+    """ State, resource, cadence, outputs and sources of a registered source, as declared by its classes. """
+    classes = SOURCES[name]['classes']
+    return {'Source': name,
+            'State': classes[0].state,
+            'Resource': max((cls.resource for cls in classes), key=RESOURCES.index),
+            'Cadence': classes[0].cadence,
+            'Outputs': list(dict.fromkeys(x for cls in classes for x in cls.outputs)),
+            'Sources': list(dict.fromkeys(x for cls in classes for x in cls.sources))}
+
+@source(Arizona)
+def scrape_arizona(start=None, end=None):
     print_start("Arizona")
     data = []
     # Arizona urls are hard-coded. Cannot be parsed automatically.
@@ -1063,99 +2132,206 @@ def scrape_arizona():
         "https://gaming.az.gov/sites/default/files/EW%20Revenue%20Report%20for%20Website%20-%20Jan%202023.pdf",
         "https://gaming.az.gov/sites/default/files/EW%20Website%20Revenue%20Report-Feb%202023.pdf"
     ]
-    for link in links:
-        scrape(data, Arizona, link)
-    # Attempt future urls.
-    for dt in get_dates(date(2023, 3, 1)):
-        month, year = dt.strftime("%b %Y").split()
-        # Attempt future dates in two formats.
-        for link in [f"https://gaming.az.gov/sites/default/files/EW%20Revenue%20Report%20for%20Website%20-%20{month}%20{year}.pdf",
-                     f"https://gaming.az.gov/sites/default/files/EW%20Website%20Revenue%20Report-{month}%20{year}.pdf"]:
-            scrape(data, Arizona, link)
-    save(data, 'Arizona (OSB).xlsx', numeric_cols=Arizona.numeric_cols)
+    links = [x for x in links if in_range(Arizona.find_timestamp(x), start, end)]
+    # Attempt future urls, in both formats.
+    guesses = {dt: [template.format(month=dt) for template in Arizona.sources[1:]] for dt in report_dates(date(2023, 3, 1), start, end)}
+    # Only the guesses which exist, and new reports, are scraped.
+    manifest = Manifest('Arizona', start=start, end=end)
+    contents = {**fetch_links(manifest.unfinished(links)), **fetch_all(manifest.unfinished_months(guesses))}
+    reports = {}
+    for link, content in manifest.changed(contents).items():
+        try:
+            print(f"Scraping {link}")
+            with stage('parse', link, profile=Arizona):
+                reports[link] = Arizona(link).read_lines()
+            manifest.add(link, content, Arizona.category, month=Arizona.find_timestamp(link))
+        except BaseException as e:
+            print(e.args)
+            print("*Unable to scrape")
+            record_failure(link, e)
+    # Every report is parsed into one frame.
+    if reports:
+        dates = [Arizona.find_timestamp(x) for x in reports]
+        with stage('clean', profile=Arizona):
+            df = Arizona.parse_reports(reports.values(), dates)
+        # A report is a month, so its rows are the rows of its month.
+        for link, dt in zip(reports, dates):
+            record_rows(link, df[df['Date'] == dt])
+        data.append(df)
+    save(data, Arizona.outputs[0], numeric_cols=Arizona.numeric_cols, start=start, end=end)
+    manifest.commit()
     print_end("Arizona")
 
-def scrape_connecticut():
-    print_start("Connecticut")
+@source(ConnecticutGaming)
+def scrape_connecticut_gaming(start=None, end=None):
+    print_start("Connecticut iGaming")
+    manifest = Manifest('Connecticut', start=start, end=end, source='connecticut_gaming')
     data = []
-    scrape(data, ConnecticutGaming, ConnecticutGaming.url)
-    save(data, 'Connecticut (iGaming).xlsx', numeric_cols=ConnecticutGaming.numeric_cols)
+    for link, content in manifest.changed(fetch_links(ConnecticutGaming.sources)).items():
+        if scrape(data, ConnecticutGaming, link):
+            manifest.add(link, content, ConnecticutGaming.category)
+    save(data, ConnecticutGaming.outputs[0], numeric_cols=ConnecticutGaming.numeric_cols, start=start, end=end)
+    manifest.commit()
+    print_end("Connecticut iGaming")
+
+@source(ConnecticutSports)
+def scrape_connecticut_sports(start=None, end=None):
+    print_start("Connecticut OSB")
+    manifest = Manifest('Connecticut', start=start, end=end, source='connecticut_sports')
     data = []
-    scrape(data, ConnecticutSports, ConnecticutSports.retail_url, 'Retail')
-    scrape(data, ConnecticutSports, ConnecticutSports.online_url, 'Online')
-    save(data, 'Connecticut (OSB).xlsx', numeric_cols=ConnecticutSports.numeric_cols)
-    print_end("Connecticut")
+    sub_categories = ConnecticutSports.sub_categories
+    for link, content in manifest.changed(fetch_links(ConnecticutSports.sources)).items():
+        if scrape(data, ConnecticutSports, link, sub_categories[link]):
+            manifest.add(link, content, ConnecticutSports.category, sub_categories[link])
+    save(data, ConnecticutSports.outputs[0], numeric_cols=ConnecticutSports.numeric_cols, start=start, end=end)
+    manifest.commit()
+    print_end("Connecticut OSB")
     
-def scrape_illinois():
+@source(Illinois)
+def scrape_illinois(start=None, end=None):
     print_start("Illinois")
-    driver = Illinois.selenium()
+    manifest = Manifest('Illinois', start=start, end=end)
+    # Reports come from a form, so months are keyed by a made up url.
+    months = {f'{Illinois.url}?month={dt:%Y-%m}': dt for dt in report_dates(date(2021, 1, 1), start, end)}
+    unfinished = manifest.unfinished(months)
+    dates = [months[key] for key in unfinished]
+    reports, failures = {}, {}
+    if dates:
+        try:
+            reports, failures = Illinois.get_reports(dates)
+        except BaseException as e:
+            print(e.args)
+            failures = {dt: e for dt in dates}
+    if failures:
+        # Form may have changed, the browser still works.
+        print('Unable to request report over HTTP, using browser')
+        try:
+            with TemporaryDirectory() as folder:
+                driver = Illinois.selenium(folder)
+                try:
+                    retried, failures = Illinois.get_reports(list(failures), driver, folder)
+                    reports.update(retried)
+                finally:
+                    driver.quit()
+        except BaseException as e:
+            print(e.args)
+            failures = {dt: e for dt in failures}
+    # Only months which failed both ways count as failures.
+    for key in unfinished:
+        if months[key] in failures:
+            print(f"*Unable to scrape {months[key]}")
+            record_failure(key, failures[months[key]])
     data = []
-    for dt in get_dates(date(2021, 1, 1)):
-        scrape(data, Illinois, dt, driver)
-    save(data, 'Illinois (OSB).xlsx', Illinois.numeric_cols)
+    for key in unfinished:
+        dt = months[key]
+        if dt not in reports:
+            continue
+        try:
+            with stage('clean', key, profile=Illinois):
+                df = Illinois(dt, reports[dt]).clean()
+            record_rows(key, df)
+            data.append(df)
+            manifest.add(key, None, Illinois.category, month=dt)
+        except BaseException as e:
+            print(e.args)
+            print(f"*Unable to scrape {dt}")
+            record_failure(key, e)
+    save(data, Illinois.outputs[0], Illinois.numeric_cols, start=start, end=end)
+    manifest.commit()
     print_end("Illinois")
 
-def scrape_indiana():
+@source(Indiana)
+def scrape_indiana(start=None, end=None):
     print_start("Indiana")
+    manifest = Manifest('Indiana', start=start, end=end)
     games_data, sports_data = [], []
-    for dt in get_dates(date(2019, 9, 1)):
+    urls = {Indiana.get_url(dt): dt for dt in report_dates(date(2019, 9, 1), start, end)}
+    for url, content in manifest.changed(fetch_all(manifest.unfinished(urls))).items():
+        dt = urls[url]
         try:
             print(f"Scraping {dt}")
-            x = Indiana(dt)
-            games_data.append(x.clean_gaming())
-            sports_data.append(x.clean_sports_betting())
-        except:
+            with stage('parse', url, profile=Indiana):
+                x = Indiana(dt, content)
+            with stage('clean', url, profile=Indiana):
+                games_data.append(x.clean_gaming())
+                sports_data.append(x.clean_sports_betting())
+            record_rows(url, pd.concat([games_data[-1], sports_data[-1]]))
+            # Workbook holds both iGaming and OSB.
+            manifest.add(url, content, None, month=dt)
+        except BaseException as e:
             print(f"*Unable to scrape {dt}")
-    save(games_data, 'Indiana (iGaming).xlsx', numeric_cols=['Win', 'Free Play', 'Other *', 'Taxable AGR', 'Table Win', 'EGD/Slot Win', 'AGR'])
-    save(sports_data, 'Indiana (OSB).xlsx', numeric_cols=['Handle', 'AGR'])
+            record_failure(url, e)
+    save(games_data, Indiana.outputs[0], numeric_cols=['Win', 'Free Play', 'Other *', 'Taxable AGR', 'Table Win', 'EGD/Slot Win', 'AGR'], start=start, end=end)
+    save(sports_data, Indiana.outputs[1], numeric_cols=['Handle', 'AGR'], start=start, end=end)
+    manifest.commit()
     print_end("Indiana")
 
-def scrape_iowa():
+@source(Iowa)
+def scrape_iowa(start=None, end=None):
     print_start("Iowa")
-    url = 'https://irgc.iowa.gov/publications-reports/sports-wagering-revenue'
+    manifest = Manifest('Iowa', start=start, end=end)
     data = []
-    historical = Iowa.get_links(f'{url}/archived-sports-revenue', 'media')
-    current = Iowa.get_links(url, 'media')
-    for link in [*historical, *current]:
-        print(f"Scraping {link}")
-        try:
-            parsed = Iowa.parse_pdf(link)
-            for p in parsed:
-                data.append(p.clean())
-        except BaseException as e:
-            print(e.args)
-            print("*Unable to scrape")
-    save(data, 'Iowa (OSB).xlsx', numeric_cols=Iowa.numeric_cols)
+    # Archived, then current reports.
+    links = [link for url in Iowa.sources for link in Iowa.get_links(url, 'media')]
+    # Archived pdfs have dozens of pages, read by a shared pool of camelot workers.
+    with worker_pool(Iowa) as pool:
+        for link, content in manifest.changed(fetch_links(links)).items():
+            print(f"Scraping {link}")
+            try:
+                with stage('parse', link, profile=Iowa):
+                    parsed = Iowa.parse_pdf(link, pool)
+                with stage('clean', link, profile=Iowa):
+                    cleaned = [p.clean() for p in parsed]
+                record_rows(link, pd.concat(cleaned) if cleaned else None)
+                data.extend(cleaned)
+                manifest.add(link, content, Iowa.category)
+            except BaseException as e:
+                print(e.args)
+                print("*Unable to scrape")
+                record_failure(link, e)
+    save(data, Iowa.outputs[0], numeric_cols=Iowa.numeric_cols, start=start, end=end)
+    manifest.commit()
     print_end("Iowa")
 
-def scrape_kansas():
+@source(Kansas)
+def scrape_kansas(start=None, end=None):
     print_start("Kansas")
     data = []
-    url = 'https://kslottery.com/publications/sports-monthly-revenues/'
-    links = get_links(url, href_keys=['media', 'revenue'])
-    for link in links:
-        scrape(data, Kansas, link)
-    save(data, 'Kansas (OSB).xlsx', Kansas.numeric_cols)
+    links = get_links(Kansas.sources[0], href_keys=['media', 'revenue'])
+    manifest = Manifest('Kansas', start=start, end=end)
+    for link, content in manifest.changed(fetch_links(manifest.unfinished(links))).items():
+        if scrape(data, Kansas, link):
+            manifest.add(link, content, Kansas.category, month=extract_date(link, r'\d{4}-\d{2}', '%Y-%m'))
+    save(data, Kansas.outputs[0], Kansas.numeric_cols, start=start, end=end)
+    manifest.commit()
     print_end("Kansas")
 
-def scrape_maryland():
+@source(Maryland)
+def scrape_maryland(start=None, end=None):
     print_start("Maryland")
     data = []
-    for dt in get_dates(date(2022, 5, 1)):
-        upload_month = dt + relativedelta(months=1)
-        upload_str = upload_month.strftime('%Y/%m')
-        data_str = dt.strftime('%B-%Y')
-        link = f'https://www.mdgaming.com/wp-content/uploads/{upload_str}/{data_str}-Sports-Wagering-Data.xlsx'
-        scrape(data, Maryland, link)
-    save(data, 'Maryland (OSB).xlsx', Maryland.numeric_cols)
+    # Each month is tried under every name.
+    candidates = {dt: [x.format(upload=dt + relativedelta(months=1), month=dt) for x in Maryland.sources]
+                  for dt in report_dates(date(2022, 5, 1), start, end)}
+    manifest = Manifest('Maryland', start=start, end=end)
+    contents = manifest.changed(fetch_all(manifest.unfinished_months(candidates)))
+    for links in candidates.values():
+        for link in links:
+            if link in contents:
+                if scrape(data, Maryland, link, contents[link]):
+                    manifest.add(link, contents[link], Maryland.category, month=extract_date(link, r'\w+-\d{4}', '%B-%Y'))
+                break
+    save(data, Maryland.outputs[0], Maryland.numeric_cols, start=start, end=end)
+    manifest.commit()
     print_end("Maryland")
 
-def scrape_michigan():
-    print_start("Michigan")
+# Michigan is left out of full runs, only running when selected.
+@source(MichiganRetailSports, MichiganOnlineSports, default=False)
+def scrape_michigan_sports(start=None, end=None):
+    print_start("Michigan OSB")
     data = []
-    url = 'https://www.michigan.gov/mgcb/detroit-casinos/resources/revenues-and-wagering-tax-information'
-    retail_osb = get_links(url, text_keys=['Retail Sports Betting', 'PDF'])
-    online_osb = get_links(url, text_keys=['Internet Sports Betting'])
+    retail_osb = get_links(Michigan.sources[0], text_keys=['Retail Sports Betting', 'PDF'])
+    online_osb = get_links(Michigan.sources[0], text_keys=['Internet Sports Betting'])
     for link in retail_osb:
         scrape(data, MichiganRetailSports, link)
     for link in online_osb:
@@ -1163,92 +2339,294 @@ def scrape_michigan():
     df = pd.concat(data)
     df = df[['State', 'Category', 'Sub-Category', 'Date', 'Operators', 'Provider', 'Sub-Provider', 
              'Total Handle', 'Total Gross Receipts', 'Adjusted Gross Receipts', 'State Tax']]
-    save([df], 'Michigan (OSB).xlsx', numeric_cols=['Total Handle', 'Total Gross Receipts', 'Adjusted Gross Receipts', 'State Tax'])
+    save([df], MichiganRetailSports.outputs[0], numeric_cols=['Total Handle', 'Total Gross Receipts', 'Adjusted Gross Receipts', 'State Tax'], start=start, end=end)
+    print_end("Michigan OSB")
 
+@source(MichiganGaming, default=False)
+def scrape_michigan_gaming(start=None, end=None):
+    print_start("Michigan iGaming")
     data = []
-    internet_games = get_links(url, text_keys=['Internet Gaming', 'Excel'])
+    internet_games = get_links(Michigan.sources[0], text_keys=['Internet Gaming', 'Excel'])
     for link, sheet in zip(internet_games, ['Internet Gaming 2023', 'Internet Gaming 2022', 'Internet Gaming 2021']):
         scrape(data, MichiganGaming, link, sheet)
     df = pd.concat(data)
     df = df[['State', 'Category', 'Date', 'Operators', 'Provider', 'Sub-Provider', 
              'Total Gross Receipts', 'Adjusted Gross Receipts', 'State Tax']]
-    save([df], 'Michigan (iGaming).xlsx', numeric_cols=['Total Gross Receipts', 'Adjusted Gross Receipts', 'State Tax'])
-    print_end("Michigan")
+    save([df], MichiganGaming.outputs[0], numeric_cols=['Total Gross Receipts', 'Adjusted Gross Receipts', 'State Tax'], start=start, end=end)
+    print_end("Michigan iGaming")
 
-def scrape_newjersey():
-    print_start("New Jersey")
-    base_url = "https://www.nj.gov/oag/ge/docs/Financials"
-    data = []
-    for dt in get_dates(date(2021, 1, 1)):
-        month, year = dt.strftime('%B %Y').split()
-        link = f'{base_url}/IGRTaxReturns/{year}/{month}{year}.pdf'
-        scrape(data, NewJerseyGaming, link)
-    save(data, 'New Jersey (iGaming).xlsx', numeric_cols=['Internet Gaming Win'])
-    
+def refresh_newjersey(cls, source, start=None, end=None):
+    """ Scrape the monthly reports of a New Jersey class. """
+    print_start(f"New Jersey {cls.category}")
+    manifest = Manifest('New Jersey', start=start, end=end, source=source)
     data = []
-    for dt in get_dates(date(2021, 1, 1)):
-        month, year = dt.strftime('%B %Y').split()
-        link = f'{base_url}/SWRTaxReturns/{year}/{month}{year}.pdf'
-        scrape(data, NewJerseySports, link)
-    save(data, 'New Jersey (OSB).xlsx', numeric_cols=['Gross Revenue'])
-    print_end("New Jersey")
-
-def scrape_newyork():
+    # Pages of every report are read across a pool of workers.
+    with worker_pool(cls) as pool:
+        links = [cls.sources[0].format(month=dt) for dt in report_dates(date(2021, 1, 1), start, end)]
+        for link, content in manifest.changed(fetch_all(manifest.unfinished(links))).items():
+            if scrape(data, cls, link, pool=pool):
+                manifest.add(link, content, cls.category, month=extract_date(link, r'\w+\d{4}', '%B%Y'))
+    save(data, cls.outputs[0], numeric_cols=[cls.value_col], start=start, end=end)
+    manifest.commit()
+    print_end(f"New Jersey {cls.category}")
+
+@source(NewJerseyGaming)
+def scrape_newjersey_gaming(start=None, end=None):
+    refresh_newjersey(NewJerseyGaming, 'newjersey_gaming', start, end)
+
+@source(NewJerseySports)
+def scrape_newjersey_sports(start=None, end=None):
+    refresh_newjersey(NewJerseySports, 'newjersey_sports', start, end)
+
+@source(NewYork)
+def scrape_newyork(start=None, end=None):
     print_start("New York")
-    url = 'https://www.gaming.ny.gov/gaming/index.php?ID=4'
     data = []
-    links = get_links(url, href_keys=['Monthly Mobile Sports Wagering Report', '.xlsx'])
-    for link in links:
-        scrape(data, NewYork, link)
-    save(data, 'New York (OSB).xlsx', numeric_cols=['GGR'])
+    links = get_links(NewYork.sources[0], href_keys=['Monthly Mobile Sports Wagering Report', '.xlsx'])
+    manifest = Manifest('New York', start=start, end=end)
+    contents = manifest.changed(fetch_links(links))
+    # Operator workbooks are read across a pool of workers.
+    with worker_pool(NewYork) as pool:
+        # Without a pool, workbooks are read while parsing.
+        sheets = {link: pool.submit(NewYork.read_workbook, fetch_path(link)) if pool else None for link in contents}
+        for link, future in sheets.items():
+            print(f"Scraping {link}")
+            try:
+                with stage('parse', link, profile=NewYork):
+                    table = NewYork(link, future.result() if future else None)
+                with stage('clean', link, profile=NewYork):
+                    df = table.clean()
+                record_rows(link, df)
+                data.append(df)
+                manifest.add(link, contents[link], NewYork.category)
+            except BaseException as e:
+                print(e.args)
+                print("*Unable to scrape")
+                record_failure(link, e)
+    save(data, NewYork.outputs[0], numeric_cols=['GGR'], start=start, end=end)
+    manifest.commit()
     print_end("New York")
 
-def scrape_pennsylvania():
-    print_start("Pennsylvania")
-    base_url = "https://gamingcontrolboard.pa.gov/files/revenue"
+def refresh_pennsylvania(cls, source, start=None, end=None):
+    """ Scrape the fiscal year workbooks of a Pennsylvania class. """
+    print_start(f"Pennsylvania {cls.category}")
+    manifest = Manifest('Pennsylvania', start=start, end=end, source=source)
     data = []
-    for i in range(2019, 2023):
-        link = f'{base_url}/Gaming_Revenue_Monthly_Interactive_Gaming_FY{i}{i+1}.xlsx'
-        scrape(data, PennsylvaniaGaming, link)
-    save(data, 'Pennsylvania (iGaming).xlsx', numeric_cols=PennsylvaniaGaming.numeric_cols)
+    for link, content in manifest.changed(fetch_links(cls.links(start, end))).items():
+        if scrape(data, cls, link):
+            manifest.add(link, content, cls.category)
+    save(data, cls.outputs[0], numeric_cols=cls.numeric_cols, start=start, end=end)
+    manifest.commit()
+    print_end(f"Pennsylvania {cls.category}")
+
+@source(PennsylvaniaGaming)
+def scrape_pennsylvania_gaming(start=None, end=None):
+    refresh_pennsylvania(PennsylvaniaGaming, 'pennsylvania_gaming', start, end)
+
+@source(PennsylvaniaSports)
+def scrape_pennsylvania_sports(start=None, end=None):
+    refresh_pennsylvania(PennsylvaniaSports, 'pennsylvania_sports', start, end)
+
+def refresh_westvirginia(cls, source, start=None, end=None):
+    """ Scrape the zip archive of a West Virginia class, linked by its link_text. """
+    print_start(f"West Virginia {cls.category}")
+    link = get_links(cls.sources[0], text_keys=cls.link_text)[0]
+    manifest = Manifest('West Virginia', start=start, end=end, source=source)
+    contents = manifest.changed(fetch_links([link]))
+    if link in contents:
+        print(f"Scraping {link}")
+        # Workbooks of the archive are read across a pool of workers.
+        with worker_pool(cls) as pool:
+            with stage('parse', link, profile=cls):
+                table = cls(ZipFile(BytesIO(contents[link])), pool)
+            with stage('clean', link, profile=cls):
+                df = table.clean()
+        record_rows(link, df)
+        save([df], cls.outputs[0], numeric_cols=cls.numeric_cols, start=start, end=end)
+        manifest.add(link, contents[link], cls.category)
+        manifest.commit()
+    print_end(f"West Virginia {cls.category}")
+
+@source(WestVirginiaSports)
+def scrape_westvirginia_sports(start=None, end=None):
+    refresh_westvirginia(WestVirginiaSports, 'westvirginia_sports', start, end)
+
+@source(WestVirginiaGaming)
+def scrape_westvirginia_gaming(start=None, end=None):
+    refresh_westvirginia(WestVirginiaGaming, 'westvirginia_gaming', start, end)
+
+### Orchestration ###
+# States with registered sources, for selecting them by state.
+STATES = list(dict.fromkeys(describe(x)['State'] for x in SOURCES))
+# How many sources of a resource are scraped at once. Downloads overlap well, pdf sources already read
+# pages across every core, and Selenium drives one real browser. Each resource has its own pool,
+# so browser and pdf sources never hold up the HTTP ones.
+RESOURCE_WORKERS = {'http': 8, 'pdf': 1, 'browser': 1}
+
+def select_sources(states=(), sources=()):
+    """ Sources named, and every source of the states named. All default sources when neither is given. """
+    if not states and not sources:
+        return [x for x in SOURCES if SOURCES[x]['default']]
+    return [x for x in SOURCES if x in sources or describe(x)['State'] in states]
+
+def run_source(name, log_folder='Logs', profile=(), profile_top=25, start=None, end=None):
+    """ 
+    Run one source's scraper, writing everything it prints to its own log file.
 
-    data = []
-    for i in range(2019, 2023):
-        link = f'{base_url}/Gaming_Revenue_Monthly_Sports_Wagering_FY{i}{i+1}.xlsx'
-        scrape(data, PennsylvaniaSports, link)   
-    #df.sort_values(by=['Date', 'Index', 'Sub-Category'])
-    save(data, 'Pennsylvania (OSB).xlsx', numeric_cols=PennsylvaniaSports.numeric_cols) 
-    print_end("Pennsylvania")
-
-def scrape_westvirginia():
-    print_start("West Virginia")
-    url = 'https://wvlottery.com/requests/2020-06-15-1110/?report=new'
-    sports_zip = get_links(url, text_keys='Sports Wagering')[0]
-    igaming_zip = get_links(url, text_keys='iGaming')[0]
-
-    HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/99.0.4844.83 Safari/537.36'}
-    szip = ZipFile(BytesIO(requests.get(sports_zip, headers=HEADERS).content))
-    izip = ZipFile(BytesIO(requests.get(igaming_zip, headers=HEADERS).content))
-
-    print(f"Scraping {sports_zip}")
-    df = WestVirginiaSports(szip).clean()
-    save([df], 'West Virginia (OSB).xlsx', numeric_cols=WestVirginiaSports.numeric_cols)
-
-    print(f"Scraping {igaming_zip}")
-    df = WestVirginiaGaming(izip).clean()
-    save([df], 'West Virginia (iGaming).xlsx', numeric_cols=WestVirginiaGaming.numeric_cols)
-    print_end("West Virgina")
+    Returns a summary of wall time, rows saved and failures. Errors are caught so one source can't take down the rest.
+    profile names states, classes or stages to profile, written to Profiles/<source>.
+    Only reports of the months from start to end are scraped, when given.
+    """
+    description = describe(name)
+    reset_metrics()
+    profile_settings.update(targets=set(profile), folder=Path('Profiles') / name, top=profile_top, count=0, active=False)
+    Path(log_folder).mkdir(exist_ok=True)
+    error = None
+    began = perf_counter()
+    with open(Path(log_folder) / f'{name}.log', 'w') as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            with profiled(description['State'], 'run', name):
+                SOURCES[name]['run'](start=start, end=end)
+        except BaseException as e:
+            traceback.print_exc()
+            error = repr(e)
+    return {'Source': name,
+            'State': description['State'],
+            'Resource': description['Resource'],
+            'Time (s)': round(perf_counter() - began, 1),
+            'Rows': run_stats['rows'],
+            'Failures': run_stats['failures'],
+            'Error': error,
+            'Metrics': json.loads(json.dumps(run_metrics))}
+
+def write_metrics(summaries, folder='Logs'):
+    """ 
+    Write the summaries and metrics of every state as a JSON report and a Prometheus text file.
+
+    The text file suits node_exporter's textfile collector, for alerting on slow states or zero rows.
+    """
+    Path(folder).mkdir(exist_ok=True)
+    report = {'finished': datetime.now().isoformat(timespec='seconds'), 'sources': {x['Source']: x for x in summaries}}
+    write_atomic(Path(folder) / 'metrics.json', json.dumps(report, indent=2).encode())
+    metrics = {
+        'scraper_source_seconds': ('Wall time of a source.', lambda x: [({}, x['Time (s)'])]),
+        'scraper_source_rows': ('Rows saved by a source.', lambda x: [({}, x['Rows'])]),
+        'scraper_source_failures': ('Documents which failed to scrape.', lambda x: [({}, x['Failures'])]),
+        'scraper_source_error': ('1 when a source stopped with an error.', lambda x: [({}, int(x['Error'] is not None))]),
+        'scraper_source_downloaded_bytes': ('Bytes downloaded by a source.', lambda x: [({}, x['Metrics']['bytes'])]),
+        'scraper_stage_seconds': ('Seconds spent in a stage, summed over threads.', 
+                                  lambda x: [({'stage': k}, v['seconds']) for k, v in x['Metrics']['stages'].items()]),
+        'scraper_stage_calls': ('Times a stage ran.', 
+                                lambda x: [({'stage': k}, v['calls']) for k, v in x['Metrics']['stages'].items()]),
+        'scraper_import_seconds': ('Seconds spent importing a backend library.', 
+                                   lambda x: [({'module': k}, v) for k, v in x['Metrics']['imports'].items()]),
+    }
+    lines = []
+    for name, (description, samples) in metrics.items():
+        lines += [f'# HELP {name} {description}', f'# TYPE {name} gauge']
+        for summary in summaries:
+            for labels, value in samples(summary):
+                labels = ','.join(f'{k}="{v}"' for k, v in {'source': summary['Source'], 'state': summary['State'], **labels}.items())
+                lines.append(f'{name}{{{labels}}} {value}')
+    lines += ['# HELP scraper_last_run_timestamp_seconds When the last run finished.', 
+              '# TYPE scraper_last_run_timestamp_seconds gauge',
+              f'scraper_last_run_timestamp_seconds {datetime.now().timestamp():.0f}']
+    write_atomic(Path(folder) / 'metrics.prom', ('\n'.join(lines) + '\n').encode())
+
+def lost_source(name, error, seconds):
+    """ Summary of a source whose process died, e.g. in native PDF code, so nothing it measured came back. """
+    description = describe(name)
+    return {'Source': name,
+            'State': description['State'],
+            'Resource': description['Resource'],
+            'Time (s)': round(seconds, 1),
+            'Rows': 0,
+            'Failures': 0,
+            'Error': repr(error),
+            'Metrics': {'stages': {}, 'documents': {}, 'bytes': 0, 'failure_reasons': [], 'profiles': [], 'imports': {}}}
+
+def orchestrate(states=None, sources=None, workers=None, profile=(), profile_top=25, start=None, end=None):
+    """ 
+    Scrape sources at the same time, in a process pool for each resource they need. workers sets how many HTTP sources run at once.
+    A single source runs in this process, without starting the pools.
+
+    Profiles taken of the states, classes or stages named in profile are listed at the end, to compare between runs.
+    """
+    names = select_sources(states or [], sources or [])
+    # Data scraped before the fact table existed is loaded once, before sources start writing to it.
+    if not Facts().exists() and Store().root.exists():
+        print('Loading the store into the fact table')
+        Facts().load(Store())
+    run = partial(run_source, profile=profile, profile_top=profile_top, start=start, end=end)
+    summaries = []
+    if len(names) == 1:
+        summaries.append(run(names[0]))
+        print(f"Finished {names[0]} in {summaries[0]['Time (s)']}s")
+    else:
+        groups = {}
+        for name in names:
+            groups.setdefault(describe(name)['Resource'], []).append(name)
+        limits = {**RESOURCE_WORKERS, 'http': workers or RESOURCE_WORKERS['http']}
+        began = perf_counter()
+        with ExitStack() as stack:
+            # Sources of one host run in several processes, so they share one set of host limits.
+            host_limits = stack.enter_context(HostLimitManager()).HostLimits()
+            futures = {}
+            for resource, group in groups.items():
+                pool = stack.enter_context(ProcessPoolExecutor(max_workers=min(limits[resource], len(group)), 
+                                                               initializer=share_host_limits, initargs=(host_limits,)))
+                futures.update({pool.submit(run, x): x for x in group})
+            for future in as_completed(futures):
+                # A crashed process breaks its pool, failing every source still queued in it, but not the other pools.
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    summary = lost_source(futures[future], e, perf_counter() - began)
+                print(f"Finished {summary['Source']} in {summary['Time (s)']}s")
+                summaries.append(summary)
+    write_metrics(summaries)
+    summary_df = pd.DataFrame(summaries).drop(columns='Metrics').sort_values('Source').set_index('Source')
+    print(summary_df.to_string())
+    profiles = [{'Source': x['Source'], **p} for x in summaries for p in x['Metrics']['profiles']]
+    if profiles:
+        print(pd.DataFrame(profiles).sort_values('seconds', ascending=False).to_string(index=False))
+    return summary_df
+
+def state_name(text):
+    """ argparse type for a state, so New Jersey can also be given as new-jersey or NewJersey. """
+    key = re.sub(r'[\W_]', '', text).lower()
+    for state in STATES:
+        if re.sub(r'\W', '', state).lower() == key:
+            return state
+    raise argparse.ArgumentTypeError(f'unknown state {text!r}, choose from {", ".join(STATES)}')
+
+def month(text):
+    """ argparse type for a YYYY-MM month. """
+    try:
+        return datetime.strptime(text, '%Y-%m').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{text!r} is not a YYYY-MM month')
 
 if __name__ == '__main__':
-    scrape_arizona()
-    scrape_connecticut()
-    scrape_illinois()
-    scrape_indiana()
-    scrape_iowa()
-    scrape_kansas()
-    scrape_maryland()
-    #scrape_michigan()
-    scrape_newjersey()
-    scrape_newyork()
-    scrape_pennsylvania()
-    scrape_westvirginia()
+    parser = argparse.ArgumentParser(description='Scrape state sports betting and iGaming revenue reports.')
+    parser.add_argument('states', nargs='*', type=state_name, help=f'States to scrape: {", ".join(STATES)}')
+    parser.add_argument('--source', nargs='+', default=[], choices=SOURCES, metavar='SOURCE', 
+                        help=f'Sources to refresh: {", ".join(SOURCES)}. Without states or sources, every default source is scraped.')
+    parser.add_argument('--list', action='store_true', help='List the registered sources and exit.')
+    parser.add_argument('--start', type=month, help='First month to scrape, as YYYY-MM.')
+    parser.add_argument('--end', type=month, help='Last month to scrape, as YYYY-MM.')
+    parser.add_argument('--workers', type=int, default=None, help=f"Number of HTTP sources scraped at once (defaults to {RESOURCE_WORKERS['http']}).")
+    parser.add_argument('--excel', action='store_true', help='Export Excel files from the store after scraping.')
+    parser.add_argument('--profile', nargs='+', default=[], metavar='TARGET', 
+                        help='States, classes (e.g. Kansas, NewJersey) or stages (e.g. save) to profile into Profiles/.')
+    parser.add_argument('--profile-top', type=int, default=25, help='Allocation sites listed per profile.')
+    args = parser.parse_args()
+    if args.list:
+        listing = pd.DataFrame([{**describe(x), 'Default': SOURCES[x]['default']} for x in SOURCES])
+        print(listing.drop(columns='Sources').to_string(index=False))
+        sys.exit()
+    if args.start and args.end and args.start > args.end:
+        parser.error('--start is after --end')
+    orchestrate(args.states, args.source, workers=args.workers, profile=args.profile, profile_top=args.profile_top, start=args.start, end=args.end)
+    if args.excel:
+        Store().export_excel()
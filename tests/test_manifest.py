@@ -0,0 +1,12 @@
+from datetime import datetime
+
+import scraper
+
+def test_month_is_final_under_any_name(tmp_path):
+    manifest = scraper.Manifest('Maryland', folder=tmp_path)
+    candidates = {month: [template.format(upload=month, month=month) for template in scraper.Maryland.sources]
+                  for month in [datetime(2022, 5, 1), datetime(2022, 6, 1)]}
+    # May was only published under its second name.
+    manifest.add(candidates[datetime(2022, 5, 1)][1], b'report', scraper.Maryland.category, month=datetime(2022, 5, 1))
+    manifest.commit()
+    assert manifest.unfinished_months(candidates) == candidates[datetime(2022, 6, 1)]
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+import scraper
+
+def michigan_gaming(months, casinos):
+    """ A MichiganGaming sheet body: field headers repeated for every casino, then two unlabelled total columns. """
+    table = scraper.MichiganGaming.__new__(scraper.MichiganGaming)
+    table.category, table.subcategory, table.year = 'iGaming', None, '2023'
+    fields = scraper.MichiganGaming.fields
+    columns = ['Month', *fields * casinos, np.nan, np.nan]
+    rows = [[month, *range(1, len(columns))] for month in months]
+    table.body = pd.DataFrame(rows, columns=columns)
+    table.header = pd.DataFrame({'Operators': [f'Operator {i}' for i in range(casinos)], 'Provider': [f'Casino {i}' for i in range(casinos)],
+                                 'Sub-Provider': [f'Platform {i}' for i in range(casinos)]})
+    return table
+
+def test_repeated_headers_are_read_by_position():
+    table = michigan_gaming(['January', 'February', 'March'], 3)
+    df = table.clean()
+    assert len(df) == 9
+    assert df['Date'].dt.month.tolist() == [1] * 3 + [2] * 3 + [3] * 3
+    assert df[scraper.MichiganGaming.fields].iloc[1].tolist() == [4, 5, 6]
+
+def test_totals_are_rows_for_the_year():
+    table = michigan_gaming(['January', 'February', 'Totals'], 2)
+    df = table.clean()
+    totals = df[df['Sub-Provider'].str.endswith('Year Total')]
+    assert len(df) == 6 and len(totals) == 2
+    assert (totals['Date'] == pd.Timestamp('2023-01-01')).all()
+    assert totals['Sub-Provider'].tolist() == ['Platform 0 Year Total', 'Platform 1 Year Total']
+    assert totals['Total Gross Receipts'].tolist() == [1, 4]
@@ -0,0 +1,30 @@
+from datetime import date
+
+import pytest
+
+import scraper
+from benchmarks import synthetic
+
+@pytest.fixture
+def report(tmp_path, monkeypatch):
+    """ A New Jersey iGaming report of two casinos, ruled into tables, with regions cached in tmp_path. """
+    pages = [synthetic.newjersey_page('NewJerseyGaming', casino) for casino in synthetic.NJ_CASINOS[:2]]
+    path = tmp_path / 'January2023.pdf'
+    path.write_bytes(synthetic.pdf_bytes(*zip(*pages)))
+    monkeypatch.setattr(scraper, 'fetch_path', lambda url: path)
+    monkeypatch.setattr(scraper.NewJersey, 'regions_path', tmp_path / 'regions.json')
+    return scraper.NewJerseyGaming.sources[0].format(month=date(2023, 1, 1))
+
+def test_cached_regions_read_the_camelot_values(report):
+    df = scraper.NewJerseyGaming(report).clean()
+    regions = scraper.NewJersey.load_regions()['NewJerseyGaming 2023']
+    assert regions['Online Poker']['text'] == 'peer-to-peer(poker)'
+    assert df.equals(scraper.NewJerseyGaming(report).clean())
+
+def test_shifted_row_is_not_read(report):
+    table = scraper.NewJerseyGaming(report)
+    table.clean()
+    regions = scraper.NewJersey.load_regions()['NewJerseyGaming 2023']
+    # The row below, as if a row had been added above it.
+    regions['Online Poker'] = {**regions['Online Casino'], 'text': regions['Online Poker']['text']}
+    assert scraper.NewJersey.read_cells(table.pdf.path, 0, regions) is None
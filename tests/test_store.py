@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import scraper
+
+FIXTURES = Path(__file__).parent.parent / 'benchmarks' / 'fixtures' / 'www.gaming.ny.gov' / 'pdf'
+
+@pytest.fixture
+def newyork():
+    """ Cleaned New York reports: a row per week, dated by month, so several rows share every identifying column. """
+    df = pd.concat([scraper.NewYork(path.name, scraper.NewYork.read_workbook(path)).clean() for path in sorted(FIXTURES.glob('*.xlsx'))])
+    assert df.duplicated(['State', 'Category', 'Date', 'Provider']).any()
+    return df
+
+def test_store_keeps_rows_sharing_a_key(tmp_path, newyork):
+    store = scraper.Store(tmp_path)
+    store.upsert(newyork, ['GGR'])
+    saved = store.read('New York', newyork['Category'].iat[0])
+    assert len(saved) == len(newyork)
+    assert saved['GGR'].sum() == newyork['GGR'].sum()
+
+def test_store_replaces_rows_scraped_again(tmp_path, newyork):
+    store = scraper.Store(tmp_path)
+    store.upsert(newyork, ['GGR'])
+    # A month scraped again, with one week fewer.
+    month = newyork[newyork['Date'] == newyork['Date'].max()].iloc[1:].assign(GGR=1)
+    store.upsert(month, ['GGR'])
+    saved = store.read('New York', newyork['Category'].iat[0])
+    rest = newyork[newyork['Date'] != newyork['Date'].max()]
+    assert len(saved) == len(rest) + len(month)
+    assert saved['GGR'].sum() == rest['GGR'].sum() + len(month)
+
+def test_store_without_numeric_columns_drops_exact_duplicates(tmp_path):
+    store = scraper.Store(tmp_path)
+    df = pd.DataFrame({'State': 'Iowa', 'Category': 'OSB', 'Date': pd.to_datetime(['2023-01-01'] * 3), 'Provider': ['A', 'A', 'B']})
+    store.upsert(df)
+    store.upsert(df)
+    assert len(store.read('Iowa', 'OSB')) == 2
+
+def test_facts_keep_the_sum_of_clean(tmp_path, newyork):
+    facts = scraper.Facts(tmp_path)
+    facts.upsert(newyork, ['GGR'])
+    facts.upsert(newyork, ['GGR'])
+    found = facts.select(state='New York', metric='GGR')
+    assert len(found) == len(newyork)
+    assert found['value'].sum() == newyork['GGR'].sum()
+
+def test_facts_replace_a_key_scraped_again(tmp_path, newyork):
+    facts = scraper.Facts(tmp_path)
+    facts.upsert(newyork, ['GGR'])
+    month = newyork[newyork['Date'] == newyork['Date'].max()].iloc[1:].assign(GGR=1)
+    facts.upsert(month, ['GGR'])
+    rest = newyork[newyork['Date'] != newyork['Date'].max()]
+    assert facts.select(state='New York')['value'].sum() == rest['GGR'].sum() + len(month)